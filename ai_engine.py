@@ -1,150 +1,43 @@
 # ai_engine.py - Clean AI logic separated from UI
 
-import google.generativeai as genai
-import json
+import asyncio
+import copy
+import functools
+import inspect
+import threading
 import time
 import os
-from config import GEMINI_MODEL, MAX_RETRIES, API_TIMEOUT
+import weakref
+from collections import OrderedDict
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from config import (
+    MODEL_BACKEND, GEMINI_MODEL, MAX_RETRIES, API_TIMEOUT, ASYNC_MAX_CONCURRENCY, GENERATION_CONFIG, PROMPT_TEMPLATE_VERSION,
+    DECISION_CACHE_ENABLED, DECISION_CACHE_MAX_ENTRIES, DECISION_CACHE_TTL_SECONDS, DECISION_CACHE_DIR,
+    ANALYSIS_FANOUT, FANOUT_MIN_PROCEDURES, FANOUT_MAX_WORKERS, BREAKER_ENABLED, FALLBACK_MODEL,
+    JUSTIFICATION_SESSIONS_MAX
+)
+from decision_cache import DecisionCache, make_cache_key
+from rate_limiter import get_shared_rate_limiter, estimate_tokens
+from parsed_case import parse_case
+import json_codec
+from stream_parser import ProcedureStreamParser
+from model_backends import create_backend
+from circuit_breaker import CircuitBreaker, CircuitOpenError, OPEN
+from single_flight import SingleFlight, LeaderAbandoned
+from justification_session import JustificationSession, session_key
+from result_model import parse_result, parse_procedure, InvalidResponseError
+from metrics import get_metrics, TOKEN_BUCKETS, WAIT_BUCKETS
 from dotenv import load_dotenv
 
 
 load_dotenv()  # This loads .env file
 
 
-class MedicalAuthorizationAI:
-    """
-    Simple AI engine for medical procedure authorization
-    Separated from UI for clarity and reusability
-    """
-    
-    def __init__(self):
-        """Initialize the AI with error handling"""
-        self.is_initialized = False
-        self.error_message = ""
-        
-        try:
-            # Get API key from environment or Streamlit secrets
-            api_key = self._get_api_key()
-            if not api_key:
-                raise ValueError("GEMINI_API_KEY not found in environment or secrets")
-            
-            # Configure the AI model
-            genai.configure(api_key=api_key)
-            self.model = genai.GenerativeModel(
-                GEMINI_MODEL,
-                generation_config={
-                    "response_mime_type": "application/json",
-                    "temperature": 0,  # Zero temperature for consistent medical decisions
-                    "max_output_tokens": 4000
-                },
-            )
-            
-            self.is_initialized = True
-            
-        except Exception as e:
-            self.error_message = str(e)
-    
-    def _get_api_key(self):
-        """Get API key from environment or Streamlit secrets"""
-        # Try environment first
-        api_key = os.getenv("GEMINI_API_KEY")
-        if api_key:
-            return api_key
-        
-        # Try Streamlit secrets
-        try:
-            import streamlit as st
-            return st.secrets.get("GEMINI_API_KEY")
-        except:
-            return None
-    
-    def analyze_case(self, patient_data):
-        """
-        Main analysis function 
-        """
-        if not self.is_initialized:
-            return self._error_response(f"AI system not initialized: {self.error_message}")
-        
-        # Create the analysis prompt
-        prompt = self._create_analysis_prompt(patient_data)
-        
-        # Try analysis with retries
-        for attempt in range(MAX_RETRIES):
-            try:
-                response = self.model.generate_content(prompt)
-                result = json.loads(response.text)
-                
-                # Validate the response structure
-                if self._is_valid_response(result):
-                    return self._enhance_response(result)
-                else:
-                    raise ValueError("Invalid response structure from AI")
-                    
-            except json.JSONDecodeError as e:
-                if attempt == MAX_RETRIES - 1:
-                    return self._error_response("Unable to process request - please try again")
-                    
-            except Exception as e:
-                # Handle rate limiting
-                if "429" in str(e):
-                    if attempt < MAX_RETRIES - 1:
-                        time.sleep(10 * (attempt + 1))  # Exponential backoff
-                        continue
-                
-                if attempt == MAX_RETRIES - 1:
-                    return self._error_response(f"Analysis failed: {str(e)[:100]}")
-                
-                time.sleep(2 ** attempt)  # Exponential backoff
-        
-        return self._error_response("Maximum retries exceeded - please try again later")
-    
-    def justify_case(self, original_case, decision_info, justification_text):
-        """Simple justification for individual procedures only"""
-        
-        if not self.is_initialized:
-            return self._error_response("AI system not initialized")
-        
-        # Simple prompt 
-        prompt = f"""
-        Review this medical authorization that was {decision_info.get('decision', 'DENIED')}.
-
-        ORIGINAL CASE: {original_case}
-        ORIGINAL DECISION: {decision_info.get('decision')}
-        ORIGINAL REASONING: {decision_info.get('reasoning', 'None provided')}
-
-        NEW JUSTIFICATION FROM PROVIDER: {justification_text}
-
-        Based on this additional information, provide JSON response:
-        {{
-            "new_decision": "APPROVED/DENIED/PENDING_ADDITIONAL_INFO",
-            "confidence": 85,
-            "justification_assessment": "Assessment of the new justification",
-            "reasoning": "Updated reasoning based on new information",
-            "still_needed": ["what else needed if still pending/denied"],
-            "decision_changed": true
-        }}
-
-        Consider if the additional justification provides sufficient medical evidence to change THIS SPECIFIC PROCEDURE'S decision.
-        Be reasonable - if good additional evidence is provided, consider approval.
-        """
-        
-        try:
-            response = self.model.generate_content(prompt)
-            result = json.loads(response.text)
-            return result
-            
-        except Exception as e:
-            return {
-                "new_decision": decision_info.get('decision', 'DENIED'),
-                "confidence": 0,
-                "justification_assessment": f"Error processing justification: {str(e)[:50]}",
-                "reasoning": "Unable to process additional information",
-                "decision_changed": False
-            }
-        
-    def _create_analysis_prompt(self, patient_data):
-        """Create the main analysis prompt with stricter authorization criteria"""
-        return f"""
+# Static half of the analysis prompt - identical on every call, so it is registered once
+# (context caching, or a system instruction as the local stand-in) instead of resent.
+# Bump PROMPT_TEMPLATE_VERSION whenever it changes.
+ANALYSIS_INSTRUCTIONS = """
     You are a medical AI for insurance procedure authorization. You must be CONSERVATIVE and follow strict medical necessity criteria.
 
     AUTHORIZATION CRITERIA:
@@ -158,9 +51,6 @@ class MedicalAuthorizationAI:
     - Clinical indication that justifies the specific procedure
     - Evidence that less expensive alternatives were considered/tried when appropriate
 
-    PATIENT DATA:
-    {patient_data}
-
     STRICT EVALUATION RULES:
     1. If no clear medical complaint/symptoms described → PENDING or DENIED
     2. If duration/severity not specified for symptoms → PENDING  
@@ -171,7 +61,7 @@ class MedicalAuthorizationAI:
 
     RESPONSE FORMAT:
     For single procedures:
-    {{
+    {
         "decision": "APPROVED/DENIED/PENDING_ADDITIONAL_INFO",
         "confidence": 85,
         "procedure_type": "specific procedure name",
@@ -184,13 +74,13 @@ class MedicalAuthorizationAI:
         "estimated_cost": "LOW/MODERATE/HIGH/VERY_HIGH", 
         "missing_info": ["specific information needed if pending"],
         "differential_diagnosis": [
-            {{"diagnosis": "Condition 1", "icd10": "ICD10-CODE", "confidence": 85}},
-            {{"diagnosis": "Condition 2", "icd10": "ICD10-CODE", "confidence": 70}}
+            {"diagnosis": "Condition 1", "icd10": "ICD10-CODE", "confidence": 85},
+            {"diagnosis": "Condition 2", "icd10": "ICD10-CODE", "confidence": 70}
         ]
-    }}
+    }
 
     For multiple procedures:
-    {{
+    {
         "multiple_procedures": true,
         "overall_summary": "brief summary of authorization decisions",
         "total_procedures": 3,
@@ -198,7 +88,7 @@ class MedicalAuthorizationAI:
         "denied_count": 1,
         "pending_count": 0,
         "procedures": [
-            {{
+            {
                 "procedure_name": "CT Abdomen",
                 "decision": "APPROVED/DENIED/PENDING_ADDITIONAL_INFO",
                 "confidence": 90,
@@ -206,67 +96,743 @@ class MedicalAuthorizationAI:
                 "urgency": "ROUTINE/URGENT/EMERGENT",
                 "estimated_cost": "LOW/MODERATE/HIGH/VERY_HIGH",
                 "missing_info": ["specific info needed if pending"]
-            }}
+            }
         ],
         "differential_diagnosis": [
-            {{"diagnosis": "Condition", "icd10": "CODE", "confidence": 85}}
+            {"diagnosis": "Condition", "icd10": "CODE", "confidence": 85}
         ]
-    }}
+    }
 
     REMEMBER: You represent insurance authorization - be conservative, require complete clinical justification, and protect against unnecessary procedures. When in doubt, request more information (PENDING) rather than automatically approving.
+"""
+ANALYSIS_INSTRUCTION_TOKENS = estimate_tokens(ANALYSIS_INSTRUCTIONS)
 
-    Only evaluate procedures explicitly listed under 'Procedures Requested:' section.
-    """
-        
-    def _create_justification_prompt(self, original_case, decision_info, justification_text):
-        """Create prompt for justification re-analysis"""
-        return f"""
-Review this medical authorization that was {decision_info.get('decision', 'DENIED')}.
-
-ORIGINAL CASE: {original_case}
-ORIGINAL DECISION: {decision_info.get('decision')}
-ORIGINAL REASONING: {decision_info.get('reasoning', 'None provided')}
-
-NEW JUSTIFICATION FROM PROVIDER: {justification_text}
+# Static half of the justification prompt - the case context and the round's delta follow in the prompt
+JUSTIFICATION_INSTRUCTIONS = """
+You review medical authorization decisions again when the provider submits additional justification.
+Each request gives the case under review, a summary of earlier justification rounds, the current decision
+and the new justification.
 
-Based on this additional information, provide JSON response:
-{{
+Provide JSON response:
+{
     "new_decision": "APPROVED/DENIED/PENDING_ADDITIONAL_INFO",
     "confidence": 85,
     "justification_assessment": "Assessment of the new justification",
     "reasoning": "Updated reasoning based on new information",
     "still_needed": ["what else needed if still pending/denied"],
     "decision_changed": true
-}}
+}
 
-Consider if the additional justification provides sufficient medical evidence to change the decision.
+Consider if the additional justification provides sufficient medical evidence to change THIS SPECIFIC PROCEDURE'S decision.
 Be reasonable - if good additional evidence is provided, consider approval.
 """
+JUSTIFICATION_INSTRUCTION_TOKENS = estimate_tokens(JUSTIFICATION_INSTRUCTIONS)
+
+
+def _timed(operation):
+    """Record the wrapped engine method's end-to-end latency as msa_operation_seconds"""
+    def decorate(method):
+        if inspect.isgeneratorfunction(method):
+            @functools.wraps(method)
+            def wrapper(self, *args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    yield from method(self, *args, **kwargs)
+                finally:
+                    self.metrics.observe("msa_operation_seconds", time.perf_counter() - started, operation=operation)
+        elif inspect.iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def wrapper(self, *args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await method(self, *args, **kwargs)
+                finally:
+                    self.metrics.observe("msa_operation_seconds", time.perf_counter() - started, operation=operation)
+        else:
+            @functools.wraps(method)
+            def wrapper(self, *args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return method(self, *args, **kwargs)
+                finally:
+                    self.metrics.observe("msa_operation_seconds", time.perf_counter() - started, operation=operation)
+        return wrapper
+    return decorate
+
+
+class MedicalAuthorizationAI:
+    """
+    Simple AI engine for medical procedure authorization
+    Separated from UI for clarity and reusability
+    """
+    
+    def __init__(self, cache=None, max_concurrency=ASYNC_MAX_CONCURRENCY, rate_limiter=None,
+                 model_name=GEMINI_MODEL, generation_config=None, fanout=ANALYSIS_FANOUT, backend=None,
+                 metrics=None, breaker=None, fallback_model=FALLBACK_MODEL, fallback_backend=None):
+        """Initialize the AI with error handling"""
+        self.is_initialized = False
+        self.error_message = ""
+        self.model_name = model_name
+        self.generation_config = dict(generation_config or GENERATION_CONFIG)
+        
+        # Every engine in the process draws from the same request/token budget
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
+        
+        # Async calls share one semaphore per event loop
+        self.max_concurrency = max_concurrency
+        self._async_semaphores = weakref.WeakKeyDictionary()
+        
+        # Fan-out mode - one concurrent call per requested procedure
+        self.fanout = fanout
+        
+        # Decision cache - repeat cases come back without a model call; cache=False turns it off
+        if cache is None and DECISION_CACHE_ENABLED:
+            cache = DecisionCache(
+                max_entries=DECISION_CACHE_MAX_ENTRIES,
+                ttl_seconds=DECISION_CACHE_TTL_SECONDS,
+                cache_dir=DECISION_CACHE_DIR
+            )
+        self.cache = None if cache is False else cache
+        
+        # Justification rounds per (case, procedure) - the case context is built once
+        self._justification_sessions = OrderedDict()
+        self._justification_lock = threading.Lock()
+        
+        # Concurrent calls for the same case attach to the one already in flight
+        self.single_flight = SingleFlight()
+        
+        # Latency, retry and token metrics (no-ops unless METRICS_ENABLED)
+        self.metrics = metrics or get_metrics()
+        
+        # Circuit breaker - while open, calls go to the fallback model or fail fast
+        if breaker is None and BREAKER_ENABLED:
+            breaker = CircuitBreaker()
+        self.breaker = breaker
+        self.fallback_model = fallback_model or (fallback_backend.name if fallback_backend is not None else None)
+        self.fallback_backend = fallback_backend
+        
+        try:
+            # Model backend - Gemini by default, MODEL_BACKEND = 'mock' runs offline
+            api_key = self._get_api_key() if MODEL_BACKEND == "gemini" else None
+            if backend is None:
+                backend = create_backend(MODEL_BACKEND, self.model_name, self.generation_config, api_key)
+            self.backend = backend
+            
+            if self.fallback_backend is None and fallback_model:
+                self.fallback_backend = create_backend(MODEL_BACKEND, fallback_model, self.generation_config, api_key)
+            
+            self.is_initialized = True
+            
+        except Exception as e:
+            self.error_message = str(e)
+    
+    def _get_api_key(self):
+        """Get API key from environment or Streamlit secrets"""
+        # Try environment first
+        api_key = os.getenv("GEMINI_API_KEY")
+        if api_key:
+            return api_key
+        
+        # Try Streamlit secrets
+        try:
+            import streamlit as st
+            return st.secrets.get("GEMINI_API_KEY")
+        except:
+            return None
+    
+    @_timed("analyze")
+    def analyze_case(self, patient_data):
+        """
+        Main analysis function 
+        """
+        if not self.is_initialized:
+            return self._error_response(f"AI system not initialized: {self.error_message}")
+        
+        # Itemized multi-procedure requests can go out as one call per procedure
+        procedures = self._fanout_procedures(patient_data)
+        
+        # Serve repeat cases from the decision cache
+        cache_key = self._cache_key(patient_data, fanout=bool(procedures))
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
+        
+        # Identical cases already in flight (double clicks, a template sent from several sessions) share one call
+        result, shared = self.single_flight.run(
+            cache_key, lambda: self._analyze_uncached(patient_data, procedures, cache_key)
+        )
+        if shared:
+            self.metrics.inc("msa_coalesced_requests_total", operation="analyze")
+        return result
+    
+    def _analyze_uncached(self, patient_data, procedures, cache_key):
+        """analyze_case body for the single-flight leader"""
+        # A call that finished between our cache miss and becoming leader has cached its result
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
+        
+        if procedures:
+            results = [None] * len(procedures)
+            for index, result in self._iter_fanout(patient_data, procedures):
+                results[index] = result
+            return self._merge_fanout(procedures, results, cache_key)
+        
+        # Create the analysis prompt
+        prompt = self._create_analysis_prompt(patient_data)
+        return self._run_analysis(prompt, cache_key)
+    
+    @_timed("analyze")
+    async def analyze_case_async(self, patient_data):
+        """
+        Async version of analyze_case - backoff never blocks the event loop
+        """
+        if not self.is_initialized:
+            return self._error_response(f"AI system not initialized: {self.error_message}")
+        
+        procedures = self._fanout_procedures(patient_data)
+        cache_key = self._cache_key(patient_data, fanout=bool(procedures))
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
+        
+        result, shared = await self.single_flight.run_async(
+            cache_key, lambda: self._analyze_uncached_async(patient_data, procedures, cache_key)
+        )
+        if shared:
+            self.metrics.inc("msa_coalesced_requests_total", operation="analyze")
+        return result
+    
+    async def _analyze_uncached_async(self, patient_data, procedures, cache_key):
+        """Async _analyze_uncached"""
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
+        
+        if procedures:
+            results = await asyncio.gather(*(
+                self._run_analysis_async(self._create_analysis_prompt(patient_data, procedure))
+                for procedure in procedures
+            ))
+            return self._merge_fanout(procedures, results, cache_key)
+        
+        prompt = self._create_analysis_prompt(patient_data)
+        return await self._run_analysis_async(prompt, cache_key)
+    
+    @_timed("analyze_stream")
+    def analyze_case_stream(self, patient_data):
+        """
+        Streaming version of analyze_case
+        Yields ("procedure", dict) as each procedure decision completes, then ("result", full_result)
+        """
+        if not self.is_initialized:
+            yield "result", self._error_response(f"AI system not initialized: {self.error_message}")
+            return
+        
+        procedures = self._fanout_procedures(patient_data)
+        cache_key = self._cache_key(patient_data, fanout=bool(procedures))
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            yield from self._replay_result(cached)
+            return
+        
+        # Same case already in flight - wait for it and replay its result
+        while True:
+            future, leader = self.single_flight.join(cache_key)
+            if leader:
+                break
+            try:
+                result = copy.deepcopy(future.result())
+            except LeaderAbandoned:
+                continue
+            self.metrics.inc("msa_coalesced_requests_total", operation="analyze_stream")
+            yield from self._replay_result(result)
+            return
+        
+        finished = False
+        try:
+            for kind, payload in self._stream_uncached(patient_data, procedures, cache_key):
+                if kind == "result":
+                    # Release waiting callers before handing the result out - our caller may stop iterating here
+                    self.single_flight.finish(cache_key, payload)
+                    finished = True
+                yield kind, payload
+        finally:
+            if not finished:
+                self.single_flight.abandon(cache_key)
     
-    def _is_valid_response(self, result):
-        """Validate AI response structure"""
+    def _replay_result(self, result):
+        """Stream events for a result that is already complete (cache hit or coalesced call)"""
         if result.get('multiple_procedures'):
-            required_fields = ["multiple_procedures", "procedures"]
+            for procedure in result.get('procedures', []):
+                yield "procedure", procedure
+        yield "result", result
+    
+    def _stream_uncached(self, patient_data, procedures, cache_key):
+        """analyze_case_stream body for the single-flight leader"""
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            yield from self._replay_result(cached)
+            return
+        
+        if procedures:
+            # Fan-out calls finish independently - each card is ready when its call returns
+            results = [None] * len(procedures)
+            for index, result in self._iter_fanout(patient_data, procedures):
+                results[index] = result
+                yield "procedure", self._fanout_procedure(procedures[index], result)
+            yield "result", self._merge_fanout(procedures, results, cache_key)
+            return
+        
+        prompt = self._create_analysis_prompt(patient_data)
+        prompt_tokens = ANALYSIS_INSTRUCTION_TOKENS + estimate_tokens(prompt)
+        emitted = 0
+        
+        for attempt in range(MAX_RETRIES):
+            try:
+                self._acquire_budget(prompt_tokens, "analyze_stream")
+                backend, admission = self._route_backend()
+                parser = ProcedureStreamParser()
+                
+                with closing(self._stream_chunks(backend, admission, prompt, prompt_tokens)) as chunks:
+                    for chunk in chunks:
+                        for procedure in parser.feed(chunk):
+                            # A retried stream repeats what the caller already has - skip those
+                            if parser.completed > emitted:
+                                card = self._stream_card(procedure, parser.completed - 1)
+                                emitted += 1
+                                yield "procedure", card
+                
+                result = self._handle_analysis_response(
+                    parser.text, cache_key, fallback=backend is not self.backend
+                )
+                self._record_attempt("analyze_stream", "success")
+                yield "result", result
+                return
+                    
+            except Exception as e:
+                failure, delay = self._retry_plan(e, attempt, "analyze_stream")
+                if failure is not None:
+                    yield "result", failure
+                    return
+                if delay:
+                    time.sleep(delay)
+        
+        yield "result", self._error_response("Maximum retries exceeded - please try again later")
+    
+    def _stream_chunks(self, backend, admission, prompt, prompt_tokens):
+        """
+        Text chunks of one streamed analysis call; the breaker and call metrics only see the backend's own errors
+        Closing it early (caller gone, or a card failed validation) releases the call without an outcome
+        """
+        call_started = time.perf_counter()
+        outcome = None
+        try:
+            response = backend.generate_stream(prompt, ANALYSIS_INSTRUCTIONS)
+            yield from response
+            outcome = True
+        except Exception:
+            outcome = False
+            raise
+        finally:
+            self._report_call(backend, admission, outcome)
+            self._observe_call("analyze_stream", call_started)
+        self._record_usage(prompt_tokens, response, "analyze_stream")
+    
+    def _stream_card(self, procedure, position):
+        """One streamed procedure, validated and normalized by the same per-procedure rules as parse_result"""
+        try:
+            return parse_procedure(procedure, f"procedures[{position}]")
+        except InvalidResponseError:
+            self.metrics.inc("msa_validation_failures_total")
+            raise
+    
+    @_timed("justify")
+    def justify_case(self, original_case, decision_info, justification_text):
+        """Simple justification for individual procedures only"""
+        
+        if not self.is_initialized:
+            return self._error_response("AI system not initialized")
+        
+        session = self._justification_session(original_case, decision_info)
+        prompt = session.build_prompt(decision_info, justification_text)
+        prompt_tokens = JUSTIFICATION_INSTRUCTION_TOKENS + estimate_tokens(prompt)
+        
+        try:
+            self._acquire_budget(prompt_tokens, "justify")
+            response = self._call_backend("justify", *self._route_backend(), prompt, JUSTIFICATION_INSTRUCTIONS)
+            self._record_usage(prompt_tokens, response, "justify")
+            result = json_codec.loads(response.body)
+            session.record(justification_text, result)
+            self._record_attempt("justify", "success")
+            return result
+            
+        except Exception as e:
+            self._record_attempt("justify", _error_class(e))
+            return self._justification_error(decision_info, e)
+    
+    @_timed("justify")
+    async def justify_case_async(self, original_case, decision_info, justification_text):
+        """Async version of justify_case"""
+        
+        if not self.is_initialized:
+            return self._error_response("AI system not initialized")
+        
+        session = self._justification_session(original_case, decision_info)
+        prompt = session.build_prompt(decision_info, justification_text)
+        prompt_tokens = JUSTIFICATION_INSTRUCTION_TOKENS + estimate_tokens(prompt)
+        
+        try:
+            # Budget first - a throttled call must not hold a concurrency slot while it waits
+            await self._acquire_budget_async(prompt_tokens, "justify")
+            async with self._get_async_semaphore():
+                response = await self._call_backend_async("justify", *self._route_backend(), prompt, JUSTIFICATION_INSTRUCTIONS)
+            self._record_usage(prompt_tokens, response, "justify")
+            result = json_codec.loads(response.body)
+            session.record(justification_text, result)
+            self._record_attempt("justify", "success")
+            return result
+            
+        except Exception as e:
+            self._record_attempt("justify", _error_class(e))
+            return self._justification_error(decision_info, e)
+    
+    def _get_cached(self, cache_key):
+        """Look up a previous decision for this case"""
+        if self.cache is None:
+            return None
+        return self.cache.get(cache_key)
+    
+    def _run_analysis(self, prompt, cache_key=None):
+        """Send one analysis prompt with rate limiting and retries"""
+        prompt_tokens = ANALYSIS_INSTRUCTION_TOKENS + estimate_tokens(prompt)
+        
+        # Try analysis with retries
+        for attempt in range(MAX_RETRIES):
+            try:
+                self._acquire_budget(prompt_tokens, "analyze")
+                backend, admission = self._route_backend()
+                response = self._call_backend("analyze", backend, admission, prompt, ANALYSIS_INSTRUCTIONS)
+                self._record_usage(prompt_tokens, response, "analyze")
+                result = self._handle_analysis_response(response.body, cache_key, fallback=backend is not self.backend)
+                self._record_attempt("analyze", "success")
+                return result
+                    
+            except Exception as e:
+                failure, delay = self._retry_plan(e, attempt, "analyze")
+                if failure is not None:
+                    return failure
+                if delay:
+                    time.sleep(delay)
+        
+        return self._error_response("Maximum retries exceeded - please try again later")
+    
+    async def _run_analysis_async(self, prompt, cache_key=None):
+        """Async _run_analysis - waits happen on the event loop"""
+        prompt_tokens = ANALYSIS_INSTRUCTION_TOKENS + estimate_tokens(prompt)
+        
+        for attempt in range(MAX_RETRIES):
+            try:
+                # Budget first - a throttled call must not hold a concurrency slot while it waits
+                await self._acquire_budget_async(prompt_tokens, "analyze")
+                async with self._get_async_semaphore():
+                    backend, admission = self._route_backend()
+                    response = await self._call_backend_async("analyze", backend, admission, prompt, ANALYSIS_INSTRUCTIONS)
+                self._record_usage(prompt_tokens, response, "analyze")
+                result = self._handle_analysis_response(response.body, cache_key, fallback=backend is not self.backend)
+                self._record_attempt("analyze", "success")
+                return result
+                    
+            except Exception as e:
+                failure, delay = self._retry_plan(e, attempt, "analyze")
+                if failure is not None:
+                    return failure
+                if delay:
+                    await asyncio.sleep(delay)
+        
+        return self._error_response("Maximum retries exceeded - please try again later")
+    
+    def _fanout_procedures(self, patient_data):
+        """Requested procedures to analyze one call each, or () for a single combined call"""
+        if not self.fanout:
+            return ()
+        procedures = parse_case(patient_data).requested_procedures
+        return procedures if len(procedures) >= FANOUT_MIN_PROCEDURES else ()
+    
+    def _iter_fanout(self, patient_data, procedures):
+        """Run one analysis per procedure concurrently, yielding (index, result) as each finishes"""
+        workers = min(len(procedures), FANOUT_MAX_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(self._run_analysis, self._create_analysis_prompt(patient_data, procedure)): index
+                for index, procedure in enumerate(procedures)
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+    
+    def _fanout_procedure(self, procedure_name, result):
+        """Shape one single-procedure result as an entry of the multiple_procedures list"""
+        if result.get('multiple_procedures') and result.get('procedures'):
+            result = result['procedures'][0]
+        procedure = {key: value for key, value in result.items() if key != 'differential_diagnosis'}
+        procedure['procedure_name'] = procedure_name
+        return procedure
+    
+    def _merge_fanout(self, procedures, results, cache_key):
+        """Merge per-procedure results into the multiple_procedures schema"""
+        merged_procedures = []
+        diagnoses = {}
+        
+        for procedure_name, result in zip(procedures, results):
+            merged_procedures.append(self._fanout_procedure(procedure_name, result))
+            
+            # Same condition suggested by several calls - keep its highest confidence
+            for diagnosis in result.get('differential_diagnosis') or []:
+                key = (diagnosis.get('icd10') or diagnosis.get('diagnosis') or '').strip().lower()
+                if not key:
+                    continue
+                known = diagnoses.get(key)
+                if known is None or diagnosis.get('confidence', 0) > known.get('confidence', 0):
+                    diagnoses[key] = diagnosis
+        
+        decisions = [procedure.get('decision') for procedure in merged_procedures]
+        approved = decisions.count('APPROVED')
+        denied = decisions.count('DENIED')
+        pending = len(decisions) - approved - denied
+        failed = [result for result in results if result.get('error')]
+        
+        merged = {
+            "multiple_procedures": True,
+            "overall_summary": f"{len(procedures)} procedures reviewed: {approved} approved, "
+                               f"{denied} denied, {pending} pending additional information",
+            "total_procedures": len(procedures),
+            "approved_count": approved,
+            "denied_count": denied,
+            "pending_count": pending,
+            "procedures": merged_procedures,
+            "differential_diagnosis": sorted(
+                diagnoses.values(), key=lambda diagnosis: diagnosis.get('confidence', 0), reverse=True
+            ),
+            "execution_mode": "fanout",
+        }
+        merged = self._enhance_response(merged)
+        
+        if len(failed) == len(results):
+            merged['error'] = True
+            merged['reasoning'] = failed[0].get('reasoning', 'Analysis failed')
+        elif not failed and self.cache is not None and not any(result.get('fallback_model') for result in results):
+            self.cache.set(cache_key, merged)
+        return merged
+    
+    def _handle_analysis_response(self, response_body, cache_key, fallback=False):
+        """Parse, validate, enhance and cache a model response (fallback-model answers are not cached)"""
+        # Decode and validate the full schema in one pass (also normalizes decisions and confidence)
+        try:
+            result = parse_result(response_body).data
+        except InvalidResponseError:
+            self.metrics.inc("msa_validation_failures_total")
+            raise
+        
+        result = self._enhance_response(result)
+        if fallback:
+            result['fallback_model'] = self.fallback_model
+        elif self.cache is not None and cache_key is not None:
+            self.cache.set(cache_key, result)
+        return result
+    
+    def _record_usage(self, estimated_tokens, response, operation):
+        """Reconcile the rate limiter once the real token count is known, and record token metrics"""
+        if response.total_tokens:
+            self.rate_limiter.record_usage(estimated_tokens, response.total_tokens)
+            self.metrics.observe("msa_call_tokens", response.total_tokens, buckets=TOKEN_BUCKETS, operation=operation)
+        if response.prompt_tokens:
+            self.metrics.inc("msa_prompt_tokens_total", response.prompt_tokens, operation=operation)
+        if response.response_tokens:
+            self.metrics.inc("msa_response_tokens_total", response.response_tokens, operation=operation)
+    
+    def _route_backend(self):
+        """
+        (backend, admission) for the next call - the primary while the breaker admits it, else the fallback model
+        admission is the breaker's token for a primary call (None otherwise), handed back by _report_call
+        Raises CircuitOpenError when the breaker is open and there is no fallback
+        """
+        if self.breaker is None:
+            return self.backend, None
+        admission = self.breaker.allow()
+        if admission is not None:
+            return self.backend, admission
+        if self.fallback_backend is not None:
+            self.metrics.inc("msa_breaker_rejections_total", route="fallback")
+            return self.fallback_backend, None
+        self.metrics.inc("msa_breaker_rejections_total", route="fail_fast")
+        raise CircuitOpenError(self.breaker.retry_after())
+    
+    def _report_call(self, backend, admission, ok):
+        """Feed a primary-backend outcome to the breaker (ok=None for a cancelled call)"""
+        if self.breaker is None or backend is not self.backend:
+            return
+        if ok is None:
+            self.breaker.release(admission)
+        elif ok:
+            self.breaker.record_success(admission)
+        else:
+            self.breaker.record_failure(admission)
+    
+    def _call_backend(self, operation, backend, admission, prompt, instructions=None):
+        """One backend call, timed as msa_model_call_seconds whether it succeeds or not"""
+        started = time.perf_counter()
+        outcome = None
+        try:
+            response = backend.generate(prompt, instructions)
+            outcome = True
+            return response
+        except Exception:
+            outcome = False
+            raise
+        finally:
+            self._report_call(backend, admission, outcome)
+            self._observe_call(operation, started)
+    
+    async def _call_backend_async(self, operation, backend, admission, prompt, instructions=None):
+        """Async _call_backend"""
+        started = time.perf_counter()
+        outcome = None
+        try:
+            response = await backend.generate_async(prompt, instructions)
+            outcome = True
+            return response
+        except Exception:
+            outcome = False
+            raise
+        finally:
+            self._report_call(backend, admission, outcome)
+            self._observe_call(operation, started)
+    
+    def _acquire_budget(self, tokens, operation):
+        """Wait for the shared RPM/TPM budget, recording the wait as msa_rate_limit_wait_seconds"""
+        wait = self.rate_limiter.acquire(tokens)
+        self.metrics.observe("msa_rate_limit_wait_seconds", wait, buckets=WAIT_BUCKETS, operation=operation)
+    
+    async def _acquire_budget_async(self, tokens, operation):
+        wait = await self.rate_limiter.acquire_async(tokens)
+        self.metrics.observe("msa_rate_limit_wait_seconds", wait, buckets=WAIT_BUCKETS, operation=operation)
+    
+    def _observe_call(self, operation, started):
+        self.metrics.observe("msa_model_call_seconds", time.perf_counter() - started, operation=operation)
+    
+    def _record_attempt(self, operation, outcome):
+        self.metrics.inc("msa_model_attempts_total", operation=operation, outcome=outcome)
+    
+    def _retry_plan(self, error, attempt, operation="analyze"):
+        """
+        Decide what to do after a failed attempt
+        Returns (error_response, None) to give up, or (None, seconds) to retry
+        """
+        failure, delay = self._plan_after_failure(error, attempt)
+        if failure is None and self.breaker is not None and self.breaker.state == OPEN:
+            # The breaker just opened - go straight to the fallback (or fail fast) instead of backing off
+            delay = 0
+        error_class = _error_class(error)
+        self._record_attempt(operation, error_class)
+        if failure is None:
+            self.metrics.inc("msa_retries_total", operation=operation, error_class=error_class)
+        return failure, delay
+    
+    def _plan_after_failure(self, error, attempt):
+        is_last_attempt = attempt == MAX_RETRIES - 1
+        
+        if isinstance(error, CircuitOpenError):
+            return self._error_response(str(error)), None
+        
+        if isinstance(error, json_codec.JSONDecodeError):
+            if is_last_attempt:
+                return self._error_response("Unable to process request - please try again"), None
+            return None, 0
+        
+        # Handle rate limiting
+        if "429" in str(error) and not is_last_attempt:
+            return None, 10 * (attempt + 1)
+        
+        if is_last_attempt:
+            return self._error_response(f"Analysis failed: {str(error)[:100]}"), None
+        
+        return None, 2 ** attempt  # Exponential backoff
+    
+    def _get_async_semaphore(self):
+        """Concurrency limit for async calls - one semaphore per event loop"""
+        loop = asyncio.get_running_loop()
+        semaphore = self._async_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._async_semaphores[loop] = semaphore
+        return semaphore
+    
+    def _justification_error(self, decision_info, error):
+        """Fallback justification result that keeps the original decision"""
+        return {
+            "new_decision": decision_info.get('decision', 'DENIED'),
+            "confidence": 0,
+            "justification_assessment": f"Error processing justification: {str(error)[:50]}",
+            "reasoning": "Unable to process additional information",
+            "decision_changed": False,
+            "error": True
+        }
+        
+    def _create_analysis_prompt(self, patient_data, procedure=None):
+        """
+        Create the per-case half of the analysis prompt (criteria and schemas are in ANALYSIS_INSTRUCTIONS)
+        With procedure set (fan-out mode) only that one procedure is evaluated
+        """
+        parsed = parse_case(patient_data)
+        age = parsed.age or "not stated"
+        scope = "Only evaluate procedures explicitly listed under 'Procedures Requested:' section."
+        
+        if procedure:
+            procedures = f"{procedure} (the other requested procedures are reviewed separately)"
+            scope = f"Evaluate ONLY this procedure: {procedure}. Use the single procedure response format."
+        elif parsed.explicit_procedures:
+            procedures = "; ".join(parsed.procedures)
+        elif parsed.section("Procedures"):
+            procedures = parsed.section("Procedures")
         else:
-            required_fields = ["decision", "confidence", "reasoning"]
+            procedures = "no explicit list - identify the requested procedure from the case text"
+        
+        return f"""
+    PATIENT DATA:
+    {patient_data}
+
+    PARSED FIELDS:
+    - Age: {age}
+    - Procedures requested: {procedures}
+
+    {scope}
+    """
         
-        return all(field in result for field in required_fields)
+    def _justification_session(self, original_case, decision_info):
+        """
+        Session for this case and procedure, created on the first round
+        original_case must be the case as analyzed - not the text with justifications appended
+        """
+        key = session_key(parse_case(original_case).case_hash, decision_info)
+        with self._justification_lock:
+            session = self._justification_sessions.get(key)
+            if session is None:
+                session = self._justification_sessions[key] = JustificationSession(original_case, decision_info)
+                if len(self._justification_sessions) > JUSTIFICATION_SESSIONS_MAX:
+                    self._justification_sessions.popitem(last=False)
+            else:
+                self._justification_sessions.move_to_end(key)
+            return session
+    
+    def _cache_key(self, patient_data, fanout=False):
+        """Key a case on its cleaned text plus model, generation config and prompt version"""
+        prompt_version = f"{PROMPT_TEMPLATE_VERSION}-fanout" if fanout else PROMPT_TEMPLATE_VERSION
+        return make_cache_key(patient_data, self.model_name, self.generation_config, prompt_version)
     
     def _enhance_response(self, result):
-        """Add helpful enhancements to the response"""
+        """Add helpful enhancements to the response (confidence is already clamped by parse_result)"""
         # Add timestamp
         result['analyzed_at'] = time.strftime('%Y-%m-%d %H:%M:%S')
-        
-        # Ensure confidence is reasonable
-        if 'confidence' in result:
-            result['confidence'] = max(0, min(100, result['confidence']))
-        
-        # Clean up procedure names
-        if result.get('multiple_procedures') and 'procedures' in result:
-            for proc in result['procedures']:
-                if 'confidence' in proc:
-                    proc['confidence'] = max(0, min(100, proc['confidence']))
-        
         return result
     
     def _error_response(self, error_message):
@@ -283,6 +849,27 @@ Be reasonable - if good additional evidence is provided, consider approval.
         """Get current AI system status"""
         return {
             "initialized": self.is_initialized,
-            "model": GEMINI_MODEL if self.is_initialized else None,
-            "error": self.error_message if not self.is_initialized else None
-        }
\ No newline at end of file
+            "model": self.model_name if self.is_initialized else None,
+            "backend": self.backend.name if self.is_initialized else None,
+            "error": self.error_message if not self.is_initialized else None,
+            "cache": self.cache.stats() if self.cache is not None else None,
+            "rate_limiter": self.rate_limiter.stats(),
+            "metrics_enabled": self.metrics.enabled,
+            "metrics_error": self.metrics.export_error,
+            "breaker": self.breaker.stats() if self.breaker is not None else None,
+            "json_codec": json_codec.CODEC,
+            "fallback_model": self.fallback_model
+        }
+
+
+def _error_class(error):
+    """Low-cardinality label for a failed attempt"""
+    if isinstance(error, json_codec.JSONDecodeError):
+        return "json_decode"
+    if isinstance(error, InvalidResponseError):
+        return "invalid_response"
+    if isinstance(error, CircuitOpenError):
+        return "circuit_open"
+    if "429" in str(error):
+        return "rate_limited"
+    return type(error).__name__
@@ -0,0 +1,319 @@
+# api_server.py - Headless HTTP API: POST /analyze and POST /justify on an async server
+# Same preprocessing, engine and JSON schema as the Streamlit app, plus a bounded request pool and idempotency keys
+# Run: python api_server.py [--host HOST] [--port PORT]
+
+import argparse
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from starlette.applications import Starlette
+from starlette.responses import Response
+from starlette.routing import Route
+
+import json_codec
+from case_store import get_case_store
+from config import (
+    API_HOST, API_PORT, API_MAX_IN_FLIGHT, API_MAX_QUEUED, API_MAX_BODY_BYTES,
+    API_IDEMPOTENCY_TTL_SECONDS, API_IDEMPOTENCY_MAX_KEYS, MAX_INPUT_LENGTH
+)
+from engine_registry import get_engine
+from justification_worker import record_outcome
+from single_flight import SingleFlight
+from utils import normalize_case, validate_input_flexible
+
+
+class ApiError(Exception):
+    """Ends a request with this status and an error body in the engine's error schema"""
+
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+class IdempotencyStore:
+    """
+    Completed responses by Idempotency-Key (LRU + TTL)
+    A key is bound to the request it first came with - reusing it for a different request is an error
+    """
+
+    def __init__(self, max_entries=API_IDEMPOTENCY_MAX_KEYS, ttl_seconds=API_IDEMPOTENCY_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (stored_at, fingerprint, status, body bytes, headers)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """(fingerprint, status, body, headers) or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry[0] >= self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1:]
+
+    def put(self, key, fingerprint, status, body, headers):
+        with self._lock:
+            self._entries[key] = (time.time(), fingerprint, status, body, headers)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class AuthorizationApi:
+    """Request handling behind the routes; engine and store default to the process-wide ones"""
+
+    def __init__(self, engine=None, store=None, max_in_flight=API_MAX_IN_FLIGHT, max_queued=API_MAX_QUEUED):
+        self._engine = engine
+        self.store = store
+        self.max_in_flight = max_in_flight
+        self.max_queued = max_queued
+        self.idempotency = IdempotencyStore()
+        self.single_flight = SingleFlight()  # Concurrent retries with one key wait for the first attempt
+        self._slots = None  # asyncio.Semaphore, created on the server's loop
+        self._in_flight = 0
+        self._queued = 0
+        self._rejected = 0
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            self._engine = get_engine()
+        return self._engine
+
+    async def _store(self):
+        """The case store - opened in a worker thread the first time (schema setup touches the disk)"""
+        if self.store is None:
+            self.store = await asyncio.to_thread(get_case_store)
+        return self.store
+
+    # Routes
+
+    async def analyze(self, request):
+        body, raw = await _read_json(request)
+        case_text = _text_field(body, "case")
+        return await self._handle(request, raw, lambda: self._analyze(case_text))
+
+    async def justify(self, request):
+        body, raw = await _read_json(request)
+        justification = _text_field(body, "justification")
+        return await self._handle(request, raw, lambda: self._justify(body, justification))
+
+    async def health(self, request):
+        status = self.engine.get_status()
+        status["api"] = {
+            "in_flight": self._in_flight,
+            "queued": self._queued,
+            "rejected": self._rejected,
+            "max_in_flight": self.max_in_flight,
+            "idempotency_keys": len(self.idempotency),
+        }
+        status["case_store"] = (await self._store()).health()
+        return _json_response(200 if status["initialized"] else 503, status)
+
+    # Request flow
+
+    async def _handle(self, request, raw, handler):
+        """Idempotency, then the bounded pool, then the handler - ApiError becomes an error response"""
+        key = request.headers.get("idempotency-key")
+        try:
+            if key is None:
+                status, body, headers = await self._in_pool(handler)
+                return _json_response(status, body, headers)
+
+            scoped_key = (request.url.path, key)
+            fingerprint = hashlib.sha256(raw).hexdigest()
+            stored = self.idempotency.get(scoped_key)
+            if stored is not None:
+                stored_fingerprint, status, body, headers = stored
+                if stored_fingerprint != fingerprint:
+                    raise ApiError(422, "Idempotency-Key was already used with a different request")
+                headers = dict(headers, **{"Idempotent-Replayed": "true"})
+                return Response(body, status_code=status, headers=headers, media_type="application/json")
+
+            # A retry that arrives while the first attempt is still running waits for it instead of running twice
+            (status, body, headers), shared = await self.single_flight.run_async(
+                (scoped_key, fingerprint), lambda: self._in_pool(handler)
+            )
+            body = json_codec.dumps_bytes(body)
+            if status < 500 and not shared:
+                self.idempotency.put(scoped_key, fingerprint, status, body, headers)  # 5xx may be retried for real
+            if shared:
+                headers = dict(headers, **{"Idempotent-Replayed": "true"})
+            return Response(body, status_code=status, headers=headers, media_type="application/json")
+        except ApiError as e:
+            return _json_response(e.status, _error_body(str(e)), e.headers)
+
+    async def _in_pool(self, handler):
+        """Run handler in one of max_in_flight slots; answer 429 when too many requests are already waiting"""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+        if self._slots.locked() and self._queued >= self.max_queued:
+            self._rejected += 1
+            raise ApiError(429, "Server busy - please retry shortly", {"Retry-After": "1"})
+
+        self._queued += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._queued -= 1
+        self._in_flight += 1
+        try:
+            return await handler()
+        finally:
+            self._in_flight -= 1
+            self._slots.release()
+
+    async def _analyze(self, case_text):
+        # Same preprocessing as the app, in a worker thread - regex passes on large cases would stall the loop
+        cleaned, (is_valid, message) = await asyncio.to_thread(_prepare_case, case_text)
+        if not is_valid:
+            raise ApiError(422, message)
+
+        engine = self.engine
+        result = await engine.analyze_case_async(cleaned)
+        if result.get('error'):
+            return 503, result, {}
+
+        store = await self._store()
+        case_id = await asyncio.to_thread(store.record_case, cleaned, result, model=engine.model_name)
+        return 200, result, {"X-Case-ID": case_id}
+
+    async def _justify(self, body, justification):
+        if len(justification) > MAX_INPUT_LENGTH:
+            raise ApiError(422, f"Justification is too long (at most {MAX_INPUT_LENGTH} characters)")
+
+        case_id, index = body.get('case_id'), body.get('procedure_index')
+        if case_id is not None and not isinstance(case_id, str):
+            raise ApiError(400, "'case_id' must be a string")
+        if case_id is not None:
+            original_case, decision_info, index = await self._stored_procedure(case_id, index)
+        else:
+            # Stateless form - the caller sends the case and the decision being disputed
+            original_case = await asyncio.to_thread(normalize_case, _text_field(body, "case"))
+            decision_info = body.get('decision')
+            if not isinstance(decision_info, dict) or not decision_info.get('decision'):
+                raise ApiError(400, "Send case_id (and procedure_index), or case plus the decision object")
+
+        result = await self.engine.justify_case_async(original_case, decision_info, justification)
+        if result.get('error'):
+            # The model call failed - not a justification round, so nothing is recorded
+            return 503, result, {}
+        if case_id is not None:
+            procedure_name = (decision_info.get('procedure_name') or decision_info.get('procedure_type')
+                              or 'Requested procedure')
+            # Same store writes as the app's justification worker
+            store = await self._store()
+            await asyncio.to_thread(
+                record_outcome, store, case_id, decision_info, procedure_name, justification, index, result
+            )
+        return 200, result, {"X-Case-ID": case_id} if case_id else {}
+
+    async def _stored_procedure(self, case_id, index):
+        """(case text, procedure dict, index) for a case analyzed earlier"""
+        store = await self._store()
+        case = await asyncio.to_thread(store.get_case, case_id)
+        if case is None:
+            raise ApiError(404, f"Unknown case_id {case_id}")
+
+        result = case['result']
+        if not result.get('multiple_procedures'):
+            return case['case_text'], result, None
+
+        procedures = result.get('procedures') or []
+        if not isinstance(index, int) or isinstance(index, bool) or not 0 <= index < len(procedures):
+            raise ApiError(422, f"procedure_index must be between 0 and {len(procedures) - 1} for this case")
+        return case['case_text'], procedures[index], index
+
+
+def _prepare_case(case_text):
+    """(cleaned text, (is_valid, message)) - sanitize + abbreviation expansion in one pass, then validation"""
+    cleaned = normalize_case(case_text)
+    return cleaned, validate_input_flexible(cleaned)
+
+
+async def _read_json(request):
+    """(decoded object, raw bytes) - bytes go straight to the JSON codec"""
+    raw = await request.body()
+    if len(raw) > API_MAX_BODY_BYTES:
+        raise ApiError(413, f"Request body is larger than {API_MAX_BODY_BYTES} bytes")
+    try:
+        body = json_codec.loads(raw)
+    except ValueError:
+        raise ApiError(400, "Request body must be a JSON object") from None
+    if not isinstance(body, dict):
+        raise ApiError(400, "Request body must be a JSON object")
+    return body, raw
+
+
+def _text_field(body, name):
+    value = body.get(name)
+    if not isinstance(value, str) or not value.strip():
+        raise ApiError(400, f"'{name}' must be a non-empty string")
+    return value
+
+
+def _error_body(message):
+    """Same shape as the engine's error responses (MedicalAuthorizationAI._error_response)"""
+    return {
+        "decision": "PENDING_ADDITIONAL_INFO",
+        "confidence": 0,
+        "reasoning": message,
+        "error": True,
+        "analyzed_at": time.strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+
+def _json_response(status, body, headers=None):
+    return Response(json_codec.dumps_bytes(body), status_code=status, headers=headers, media_type="application/json")
+
+
+def _errors_as_responses(handler):
+    """ApiError raised while reading the request (before _handle) still gets an error body"""
+    async def route(request):
+        try:
+            return await handler(request)
+        except ApiError as e:
+            return _json_response(e.status, _error_body(str(e)), e.headers)
+    return route
+
+
+def create_app(engine=None, store=None, max_in_flight=API_MAX_IN_FLIGHT, max_queued=API_MAX_QUEUED):
+    """ASGI app - serve with any ASGI server (uvicorn api_server:app)"""
+    api = AuthorizationApi(engine, store, max_in_flight, max_queued)
+    app = Starlette(routes=[
+        Route("/analyze", _errors_as_responses(api.analyze), methods=["POST"]),
+        Route("/justify", _errors_as_responses(api.justify), methods=["POST"]),
+        Route("/health", api.health, methods=["GET"]),
+    ])
+    app.state.api = api
+    return app
+
+
+app = create_app()
+
+
+def main(argv=None):
+    """Command line entry point"""
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Headless HTTP API for authorization decisions")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    args = parser.parse_args(argv)
+
+    # One process, one event loop - concurrency comes from async engine calls, not worker processes
+    uvicorn.run(app, host=args.host, port=args.port, log_level="info")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,33 @@
 # app.py - Clean, simple main application file
 import streamlit as st
-from datetime import datetime
+import time
+import uuid
 
 # Import our clean components
-from ai_engine import MedicalAuthorizationAI
+from engine_registry import get_engine
 from ui_components import (
     render_header, 
     render_sidebar, 
     render_input_section, 
     render_results_section,
+    render_streaming_results,
     render_footer_metrics,
-    render_diagnosis_display  # Add this import
+    render_diagnosis_display,  # Add this import
+    render_justification_results,
+    collect_justification_results,
+    current_case
 )
-from utils import load_css, validate_input_flexible, clean_input, sanitize_medical_input
+from case_store import get_case_store
+from assets import get_assets, inject_assets
+from utils import validate_input_flexible, normalize_case
 from config import APP_TITLE
 
 def configure_app():
     """Configure Streamlit app settings"""
-    try:
-        # Try to load favicon (optional)
-        from PIL import Image
-        favicon = Image.open("images/cloudsolutions-logo.png")
-    except:
-        favicon = None
-    
+    # Favicon is decoded once per process (None when PIL or the file is missing)
     st.set_page_config(
         page_title="MSA-AI",
-        page_icon=favicon,
+        page_icon=get_assets().favicon,
         layout="wide",
         initial_sidebar_state="expanded"
     )
@@ -34,9 +35,10 @@ def configure_app():
 
 def initialize_ai():
     """Initialize AI system with proper error handling"""
-    if 'medical_ai' not in st.session_state:
+    # Sessions share one process-wide engine - only the first session pays for setup
+    if 'medical_ai' not in st.session_state or not st.session_state.medical_ai.is_initialized:
         with st.spinner("Initializing AI system..."):
-            st.session_state.medical_ai = MedicalAuthorizationAI()
+            st.session_state.medical_ai = get_engine()
     
     # Check if initialization failed
     if not st.session_state.medical_ai.is_initialized:
@@ -44,10 +46,10 @@ def initialize_ai():
         st.info("ℹ Please ensure GEMINI_API_KEY is set in your environment variables or Streamlit secrets")
         st.stop()
 
-def handle_analysis(patient_data):
+def handle_analysis(patient_data, results_slot=None):
     """Handle case analysis with improved error handling"""
-    # Clean and validate input
-    cleaned_data = clean_input(sanitize_medical_input(patient_data))
+    # Clean and validate input (sanitize + abbreviation expansion in one pass)
+    cleaned_data = normalize_case(patient_data)
     
     # Validate input
     is_valid, validation_message = validate_input_flexible(cleaned_data)
@@ -55,14 +57,21 @@ def handle_analysis(patient_data):
         st.error(f"❌ **Input Error:** {validation_message}")
         return
     
-    # Perform analysis
+    # Perform analysis - stream decision cards into the results column when there is one
     with st.spinner(" AI analyzing case... This may take 10-15 seconds"):
-        result = st.session_state.medical_ai.analyze_case(cleaned_data)
+        started = time.perf_counter()
+        if results_slot is not None:
+            events = st.session_state.medical_ai.analyze_case_stream(cleaned_data)
+            result = render_streaming_results(events, results_slot)
+        else:
+            result = st.session_state.medical_ai.analyze_case(cleaned_data)
         
-        # Store results
-        st.session_state.last_result = result
-        st.session_state.last_case = cleaned_data
-        st.session_state.analysis_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        # Store results - the session keeps only the case ID
+        session_id = st.session_state.setdefault('session_id', uuid.uuid4().hex)
+        st.session_state.case_id = get_case_store().record_case(
+            cleaned_data, result, session_id=session_id, model=st.session_state.medical_ai.model_name
+        )
+        st.session_state.analysis_seconds = time.perf_counter() - started
         
         # Clear any previous updates
         keys_to_clear = [key for key in st.session_state.keys() if key.startswith('results_container_')]
@@ -81,8 +90,8 @@ def main():
     # Configure the app
     configure_app()
     
-    # Load styling
-    load_css()
+    # Load styling - sent once per browser session
+    inject_assets()
     
     # Render header
     render_header()
@@ -90,9 +99,18 @@ def main():
     # Initialize AI system
     initialize_ai()
     
+    # Pick up justification rounds that finished in the background (before the input box is drawn)
+    collect_justification_results()
+    
+    # This session's current case, loaded once per run
+    case = current_case()
+    
     # Create main layout
     col1, col2 = st.columns([1, 1], gap="large")
     
+    # Live decision cards stream in here while an analysis runs
+    results_slot = col2.empty()
+    
     # Left column: Input, sidebar, and diagnoses
     with col1:
         render_sidebar()
@@ -102,15 +120,17 @@ def main():
         
         # Handle analysis button click
         if analyze_button and patient_data.strip():
-            handle_analysis(patient_data)
+            handle_analysis(patient_data, results_slot)
+            case = current_case()
         
         # ADD DIAGNOSES HERE - under the input section
-        if 'last_result' in st.session_state:
-            render_diagnosis_display(st.session_state.last_result)
+        if case is not None:
+            render_diagnosis_display(case['result'])
     
     # Right column: Authorization Results (without diagnoses now)
     with col2:
-        render_results_section()
+        render_justification_results()
+        render_results_section(case)
     
     # Footer metrics
     render_footer_metrics()
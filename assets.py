@@ -0,0 +1,128 @@
+# assets.py - Stylesheets and images, built once per process and injected once per browser session
+# Every stylesheet is merged in cascade order and minified, with images inlined as data URIs. The bundle is
+# keyed by its content hash, so a session only receives it again after the files change
+
+import base64
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import threading
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+from config import ASSET_STYLESHEETS, ASSET_IMAGES, FAVICON_PATH
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+_STRING_RE = re.compile(r"""("(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')""")
+_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+_SPACE_RE = re.compile(r"\s+")
+_PUNCTUATION_RE = re.compile(r"\s*([{};,>])\s*")
+_COLON_RE = re.compile(r":\s+")  # Only after a colon - "a :hover" and "a:hover" are different selectors
+_ASSET_URL_RE = re.compile(r"""url\(\s*(["']?)asset:([\w-]+)\1\s*\)""")
+
+
+class AssetBundle:
+    """Merged stylesheet plus the favicon; digest identifies this exact content"""
+
+    __slots__ = ("css", "digest", "favicon", "missing", "source_bytes")
+
+    def __init__(self, css, favicon, missing, source_bytes):
+        self.css = css
+        self.digest = hashlib.sha256(css.encode("utf-8")).hexdigest()[:16]
+        self.favicon = favicon
+        self.missing = missing
+        self.source_bytes = source_bytes
+
+
+def minify_css(css):
+    """Drop comments and whitespace that doesn't change the meaning (quoted strings are left alone)"""
+    css = _COMMENT_RE.sub("", css)
+    parts = _STRING_RE.split(css)
+    for i in range(0, len(parts), 2):  # Even parts are outside quotes
+        text = _SPACE_RE.sub(" ", parts[i])
+        text = _PUNCTUATION_RE.sub(r"\1", text)
+        parts[i] = _COLON_RE.sub(":", text)
+    return "".join(parts).replace(";}", "}").strip()
+
+
+def build_assets(stylesheets=ASSET_STYLESHEETS, images=ASSET_IMAGES, favicon_path=FAVICON_PATH):
+    """Read, merge and minify everything (once per process - see get_assets)"""
+    sources, missing = [], []
+    for path in stylesheets:
+        try:
+            with open(os.path.join(ROOT, path), "r", encoding="utf-8") as f:
+                sources.append(f.read())
+        except FileNotFoundError:
+            missing.append(path)
+
+    data_uris = {}
+    for name, path in images.items():
+        try:
+            with open(os.path.join(ROOT, path), "rb") as f:
+                encoded = base64.b64encode(f.read()).decode("ascii")
+        except FileNotFoundError:
+            missing.append(path)
+            continue
+        mime = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        data_uris[name] = f"data:{mime};base64,{encoded}"
+
+    css = minify_css("\n".join(sources))
+    css = _ASSET_URL_RE.sub(lambda m: f'url("{data_uris.get(m.group(2), "")}")', css)
+    return AssetBundle(css, _load_favicon(favicon_path), missing, sum(len(source) for source in sources))
+
+
+def _load_favicon(path):
+    """Decoded once - set_page_config runs on every rerun"""
+    try:
+        from PIL import Image
+
+        favicon = Image.open(os.path.join(ROOT, path))
+        favicon.load()
+        return favicon
+    except Exception:
+        return None
+
+
+def inject_assets():
+    """Send the stylesheet to this browser session unless it already has this version"""
+    bundle = get_assets()
+    if st.session_state.get("assets_injected") == bundle.digest:
+        return
+
+    if bundle.missing:
+        st.warning(f"Asset files not found - using basic styling for: {', '.join(bundle.missing)}")
+
+    # A <style> element in the page is dropped as soon as a rerun stops emitting it, so the sheet goes into
+    # the document head instead, where it stays for the life of the page
+    css = json.dumps(bundle.css).replace("</", "<\\/")
+    components.html(f"""<script>
+(function () {{
+    const doc = window.parent.document;
+    const id = "msa-assets-{bundle.digest}";
+    if (doc.getElementById(id)) return;
+    doc.querySelectorAll("style[data-msa-assets]").forEach(function (old) {{ old.remove(); }});
+    const style = doc.createElement("style");
+    style.id = id;
+    style.setAttribute("data-msa-assets", "");
+    style.textContent = {css};
+    doc.head.appendChild(style);
+}})();
+</script>""", height=0)
+    st.session_state.assets_injected = bundle.digest
+
+
+_shared_bundle = None
+_shared_lock = threading.Lock()
+
+
+def get_assets():
+    """Process-wide bundle, built on first use"""
+    global _shared_bundle
+    with _shared_lock:
+        if _shared_bundle is None:
+            _shared_bundle = build_assets()
+        return _shared_bundle
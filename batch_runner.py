@@ -0,0 +1,190 @@
+# batch_runner.py - Run authorization over JSONL/CSV case files without the UI
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED, ALL_COMPLETED
+
+import json_codec
+from engine_registry import get_engine
+from utils import validate_input_flexible, normalize_case
+from config import BATCH_WORKERS
+
+# Column / key names accepted for the case id and the case text
+ID_FIELDS = ("case_id", "id")
+TEXT_FIELDS = ("case", "text", "patient_data")
+
+# Output statuses a resume skips - "error" records (model failures, open breaker) are retried
+FINISHED_STATUSES = ("ok", "invalid")
+
+
+def iter_cases(input_path):
+    """
+    Stream (case_id, case_text, problem) from a .jsonl or .csv file
+    problem describes a record that could not be read (it is written as invalid); None otherwise
+    """
+    if input_path.lower().endswith(".csv"):
+        with open(input_path, "r", encoding="utf-8", newline="") as f:
+            for row_number, row in enumerate(csv.DictReader(f), 1):
+                yield _case_from_record(row, row_number) + (None,)
+    else:
+        with open(input_path, "rb") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                # One malformed line must not abort the run - it becomes an invalid record keyed by line number
+                try:
+                    record = json_codec.loads(line)
+                except ValueError:
+                    yield str(line_number), None, "Line is not valid JSON"
+                    continue
+                if not isinstance(record, dict):
+                    yield str(line_number), None, "Line is not a JSON object"
+                    continue
+                yield _case_from_record(record, line_number) + (None,)
+
+
+def _case_from_record(record, position):
+    """Pick the id and text out of one input record"""
+    case_id = next((str(record[k]) for k in ID_FIELDS if record.get(k) not in (None, "")), str(position))
+    text = next((record[k] for k in TEXT_FIELDS if record.get(k)), "")
+    return case_id, text
+
+
+def load_completed_ids(output_path):
+    """
+    Read case ids already finished in the output file - this is the resume checkpoint
+    Only ok/invalid records count; cases that ended in error are run again and the newer line wins
+    """
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+
+    with open(output_path, "rb") as f:
+        for line in f:
+            try:
+                record = json_codec.loads(line)
+                if record["status"] in FINISHED_STATUSES:
+                    completed.add(record["case_id"])
+            except (ValueError, KeyError, TypeError):
+                # A crash can leave a truncated last line - that case is simply redone
+                continue
+    return completed
+
+
+def _ends_with_newline(path):
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def process_case(engine, case_id, case_text, problem=None):
+    """Run one case through the same pipeline as the Streamlit app - never raises, bad input becomes invalid"""
+    started = time.perf_counter()
+    record = {"case_id": case_id}
+
+    try:
+        if problem is None and (not isinstance(case_text, str) or not case_text.strip()):
+            problem = "Case text is missing or not a string"
+        if problem is not None:
+            is_valid, validation_message = False, problem
+        else:
+            cleaned = normalize_case(case_text)
+            is_valid, validation_message = validate_input_flexible(cleaned)
+        record["validation_message"] = validation_message
+
+        if not is_valid:
+            record["status"] = "invalid"
+            record["result"] = None
+        else:
+            result = engine.analyze_case(cleaned)
+            record["status"] = "error" if result.get("error") else "ok"
+            record["result"] = result
+    except Exception as e:
+        record["status"] = "error"
+        record["result"] = {"error": True, "reasoning": str(e)[:200]}
+
+    record["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    record["processed_at"] = time.strftime('%Y-%m-%d %H:%M:%S')
+    return record
+
+
+def run_batch(input_path, output_path, engine=None, workers=BATCH_WORKERS, resume=True, progress=None):
+    """
+    Analyze every case in input_path and append one JSON line per case to output_path
+    Cases already finished in output_path (ok or invalid) are skipped when resume is True
+    """
+    engine = engine or get_engine()
+    if not engine.is_initialized:
+        raise RuntimeError(f"AI system not initialized: {engine.error_message}")
+
+    completed = load_completed_ids(output_path) if resume else set()
+    summary = {"total": 0, "skipped": 0, "ok": 0, "invalid": 0, "error": 0}
+    started = time.perf_counter()
+
+    mode = "a" if resume else "w"
+    with open(output_path, mode, encoding="utf-8") as out, ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+
+        # Start on a fresh line if the previous run died mid-write
+        if resume and out.tell() > 0 and not _ends_with_newline(output_path):
+            out.write("\n")
+
+        def drain(return_when):
+            nonlocal pending
+            done, pending = wait(pending, return_when=return_when)
+            for future in done:
+                record = future.result()
+                out.write(json_codec.dumps(record) + "\n")
+                out.flush()
+                summary[record["status"]] += 1
+                if progress:
+                    progress(record)
+
+        for case_id, case_text, problem in iter_cases(input_path):
+            summary["total"] += 1
+            if case_id in completed:
+                summary["skipped"] += 1
+                continue
+
+            pending.add(pool.submit(process_case, engine, case_id, case_text, problem))
+
+            # Keep the queue bounded so huge files never load into memory
+            if len(pending) >= workers * 2:
+                drain(FIRST_COMPLETED)
+
+        if pending:
+            drain(ALL_COMPLETED)
+
+    summary["elapsed_seconds"] = round(time.perf_counter() - started, 2)
+    return summary
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Batch medical authorization for JSONL/CSV case files")
+    parser.add_argument("input", help="Input .jsonl or .csv file (fields: case_id/id, case/text/patient_data)")
+    parser.add_argument("output", help="Output .jsonl file - also used as the resume checkpoint")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS, help="Concurrent model calls")
+    parser.add_argument("--no-resume", action="store_true", help="Overwrite output instead of resuming")
+    args = parser.parse_args(argv)
+
+    def report(record):
+        print(f"{record['case_id']}: {record['status']} ({record['elapsed_ms']} ms)", file=sys.stderr)
+
+    try:
+        summary = run_batch(args.input, args.output, workers=args.workers,
+                            resume=not args.no_resume, progress=report)
+    except RuntimeError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+# bench_api.py - Concurrent load against the HTTP API (api_server.py) served by uvicorn, offline with MockBackend
+# Run: python benchmarks/bench_api.py [--requests N] [--concurrency N] [--latency SECONDS]
+
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import uvicorn
+
+import json_codec
+from ai_engine import MedicalAuthorizationAI
+from api_server import create_app
+from bench_suite import make_case, percentile
+from case_store import CaseStore
+from model_backends import MockBackend
+from rate_limiter import RateLimiter
+
+
+def start_server(app):
+    """uvicorn on a free local port in a daemon thread; returns (server, port)"""
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, port
+
+
+async def post(port, path, body, headers=None):
+    """One HTTP/1.1 request on its own connection - (status, response headers, decoded body)"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    payload = json_codec.dumps_bytes(body)
+    extra = "".join(f"{name}: {value}\r\n" for name, value in (headers or {}).items())
+    writer.write(
+        f"POST {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(payload)}\r\n{extra}Connection: close\r\n\r\n".encode("ascii") + payload
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+
+    head, _, data = response.partition(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    response_headers = dict(line.split(": ", 1) for line in lines[1:])
+    return int(lines[0].split()[1]), {k.lower(): v for k, v in response_headers.items()}, json_codec.loads(data)
+
+
+async def load(port, total, concurrency):
+    """total distinct /analyze requests, at most concurrency open at once"""
+    gate = asyncio.Semaphore(concurrency)
+    latencies, statuses = [], {}
+
+    async def one(variant):
+        async with gate:
+            started = time.perf_counter()
+            status, _, _ = await post(port, "/analyze", {"case": make_case(variant, procedures=3)})
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return time.perf_counter() - started, sorted(latencies), statuses
+
+
+async def check_idempotency(port, backend):
+    """Concurrent retries with one Idempotency-Key reach the model once"""
+    calls = backend.calls
+    body = {"case": make_case("idempotent", procedures=2)}
+    replies = await asyncio.gather(*(post(port, "/analyze", body, {"Idempotency-Key": "bench-1"}) for _ in range(20)))
+    case_ids = {headers.get("x-case-id") for _, headers, _ in replies}
+    replayed = sum(1 for _, headers, _ in replies if headers.get("idempotent-replayed") == "true")
+    assert {status for status, _, _ in replies} == {200}, [status for status, _, _ in replies]
+    assert len(case_ids) == 1, case_ids
+    status, _, _ = await post(port, "/analyze", {"case": make_case("other", procedures=2)}, {"Idempotency-Key": "bench-1"})
+    assert status == 422, status
+    return backend.calls - calls, replayed
+
+
+async def check_justify(port):
+    """Justify against a stored case by ID"""
+    status, headers, result = await post(port, "/analyze", {"case": make_case("justify", procedures=2)})
+    assert status == 200, result
+    status, _, outcome = await post(port, "/justify", {
+        "case_id": headers["x-case-id"], "procedure_index": 0,
+        "justification": "Symptoms persisted after 6 weeks of conservative treatment and physical therapy.",
+    })
+    assert status == 200 and "new_decision" in outcome, outcome
+    status, _, _ = await post(port, "/justify", {"case_id": "missing", "justification": "More detail"})
+    assert status == 404, status
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.2, help="Median mock model latency in seconds")
+    args = parser.parse_args(argv)
+
+    backend = MockBackend(latency_median=args.latency, latency_sigma=0.2)
+    engine = MedicalAuthorizationAI(backend=backend, rate_limiter=RateLimiter(rpm=0, tpm=0),
+                                    max_concurrency=args.concurrency, fallback_model=None)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = CaseStore(path=os.path.join(tmp, "cases.db"))
+        server, port = start_server(create_app(engine=engine, store=store))
+        try:
+            elapsed, latencies, statuses = asyncio.run(load(port, args.requests, args.concurrency))
+            model_calls, replayed = asyncio.run(check_idempotency(port, backend))
+            asyncio.run(check_justify(port))
+        finally:
+            server.should_exit = True
+
+    print(f"HTTP API benchmark - {args.requests} cases, {args.concurrency} concurrent, "
+          f"mock latency {args.latency * 1000:.0f} ms median, JSON codec {json_codec.CODEC}\n")
+    print(f"throughput      {args.requests / elapsed:8.1f} req/s")
+    print(f"latency p50     {percentile(latencies, 0.50) * 1000:8.1f} ms")
+    print(f"latency p99     {percentile(latencies, 0.99) * 1000:8.1f} ms")
+    print(f"statuses        {statuses}")
+    print(f"idempotency     20 concurrent retries -> {model_calls} model call(s), {replayed} replayed")
+
+
+if __name__ == "__main__":
+    main()
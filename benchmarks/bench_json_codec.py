@@ -0,0 +1,70 @@
+# bench_json_codec.py - stdlib json vs orjson on model responses and exports
+# Run: python benchmarks/bench_json_codec.py
+
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import json_codec
+from bench_suite import make_result
+
+PROCEDURE_COUNTS = [1, 10, 50]
+BATCH_CASES = 200  # Results in one batch export
+REPEAT = 200
+
+
+def stdlib_cases(result, batch):
+    text = json.dumps(result)
+    body = text.encode("utf-8")
+    return {
+        "decode response (str)": lambda: json.loads(text),
+        "decode response (bytes)": lambda: json.loads(body),
+        "encode export (indent 2)": lambda: json.dumps(result, indent=2, ensure_ascii=False).encode("utf-8"),
+        f"encode batch of {BATCH_CASES}": lambda: json.dumps(batch, ensure_ascii=False).encode("utf-8"),
+    }
+
+
+def codec_cases(result, batch):
+    text = json.dumps(result)
+    body = text.encode("utf-8")
+    return {
+        "decode response (str)": lambda: json_codec.loads(text),
+        "decode response (bytes)": lambda: json_codec.loads(body),
+        "encode export (indent 2)": lambda: json_codec.dumps_bytes(result, indent=True),
+        f"encode batch of {BATCH_CASES}": lambda: json_codec.dumps_bytes(batch),
+    }
+
+
+def _decoded(value):
+    """Compare encoders by what they decode back to"""
+    return json.loads(value) if isinstance(value, (str, bytes)) else value
+
+
+def bench(func):
+    """Best per-call time in microseconds"""
+    timings = timeit.repeat(func, number=REPEAT, repeat=5)
+    return min(timings) / REPEAT * 1e6
+
+
+def main():
+    print(f"JSON codec benchmark - json_codec is using {json_codec.CODEC}, best of 5 x {REPEAT} calls\n")
+    if json_codec.CODEC == "stdlib":
+        print("orjson is not installed (or JSON_CODEC = 'stdlib') - both columns measure the json module\n")
+    print(f"{'case':<28} {'procedures':>10} {'stdlib (us)':>12} {'codec (us)':>11} {'speedup':>8}")
+
+    for count in PROCEDURE_COUNTS:
+        result = make_result(count)
+        batch = [make_result(count) for _ in range(BATCH_CASES)]
+        stdlib, codec = stdlib_cases(result, batch), codec_cases(result, batch)
+        for name, baseline in stdlib.items():
+            assert _decoded(codec[name]()) == _decoded(baseline()), name
+            before = bench(baseline)
+            after = bench(codec[name])
+            print(f"{name:<28} {count:>10} {before:>12.1f} {after:>11.1f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# bench_normalization.py - Old multi-pass regex helpers vs the precompiled text_normalizer
+# Run: python benchmarks/bench_normalization.py
+
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import text_normalizer
+from config import AGE_PATTERNS, EXAMPLE_CASES, MAX_INPUT_LENGTH
+
+INPUT_SIZE = 5000
+REPEAT = 200
+
+
+# Reference copies of the original utils.py implementations
+def legacy_extract_age(text):
+    text_lower = text.lower()
+    if 'elderly' in text_lower or 'senior' in text_lower:
+        return "65+"
+    if 'middle' in text_lower and 'age' in text_lower:
+        return "45-65"
+    if 'young adult' in text_lower:
+        return "18-35"
+    sixties_match = re.search(r'\b(\d{1,2})s\b', text_lower)
+    if sixties_match:
+        return f"{int(sixties_match.group(1))}0s"
+    for pattern in AGE_PATTERNS[:3]:
+        match = re.search(pattern, text_lower)
+        if match:
+            return match.group(1)
+    return None
+
+
+def legacy_clean_input(text):
+    replacements = {
+        'abd': 'abdomen', 'htn': 'hypertension', 'dm': 'diabetes mellitus',
+        'mi': 'myocardial infarction', 'sob': 'shortness of breath', 'cp': 'chest pain',
+        'yo': 'years old', 'y.o.': 'years old'
+    }
+    cleaned = text
+    for abbrev, full in replacements.items():
+        cleaned = re.sub(rf'\b{re.escape(abbrev)}\b', full, cleaned, flags=re.IGNORECASE)
+    return cleaned
+
+
+def legacy_sanitize(text):
+    sanitized = re.sub(r'[<>{}[\]\\]', '', text)
+    sanitized = re.sub(r'\s+', ' ', sanitized)
+    return sanitized.strip()
+
+
+def legacy_pipeline(text):
+    cleaned = legacy_clean_input(legacy_sanitize(text))
+    return cleaned, legacy_extract_age(cleaned)
+
+
+def new_pipeline(text):
+    cleaned = text_normalizer.normalize_case(text)
+    return cleaned, text_normalizer.extract_age(cleaned)
+
+
+def build_inputs():
+    """~5,000 character cases: a realistic one and an abbreviation-heavy one with no age"""
+    realistic = "\n\n".join(EXAMPLE_CASES.values())
+    realistic = (realistic * (INPUT_SIZE // len(realistic) + 1))[:INPUT_SIZE]
+
+    dense = "Pt w/ HTN, DM, hx of MI, SOB and CP, abd pain. " 
+    dense = (dense * (INPUT_SIZE // len(dense) + 1))[:INPUT_SIZE]
+
+    return {"realistic": realistic, "abbreviation-dense, no age": dense}
+
+
+def bench(func, text):
+    """Best per-call time in microseconds"""
+    timings = timeit.repeat(lambda: func(text), number=REPEAT, repeat=5)
+    return min(timings) / REPEAT * 1e6
+
+
+def main():
+    assert INPUT_SIZE <= MAX_INPUT_LENGTH
+    print(f"Normalization benchmark - {INPUT_SIZE} character inputs, best of 5 x {REPEAT} calls\n")
+    print(f"{'input':<28} {'legacy (us)':>12} {'new (us)':>10} {'speedup':>8}")
+
+    for name, text in build_inputs().items():
+        assert legacy_pipeline(text) == new_pipeline(text), name
+        legacy = bench(legacy_pipeline, text)
+        new = bench(new_pipeline, text)
+        print(f"{name:<28} {legacy:>12.1f} {new:>10.1f} {legacy / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# bench_procedure_matcher.py - Worst-case timing of the old synonym regex scan vs the automaton
+# Run: python benchmarks/bench_procedure_matcher.py
+
+import os
+import random
+import re
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from procedure_matcher import ProcedureMatcher, default_matcher
+from config import PROCEDURE_SYNONYMS, MAX_INPUT_LENGTH
+
+SIZES = [500, 1000, 2500, MAX_INPUT_LENGTH]
+LARGE_CATALOG_SIZE = 20000
+
+
+def legacy_find_mentions(text, synonym_groups=PROCEDURE_SYNONYMS):
+    """Reference copy of the original extract_procedures fallback loop"""
+    procedures = []
+    text_lower = text.lower()
+    for keyword, synonyms in synonym_groups.items():
+        for synonym in synonyms:
+            if synonym in text_lower:
+                pattern = rf'\b[^.]*{re.escape(synonym)}[^.]*\b'
+                matches = re.findall(pattern, text_lower)
+                if matches:
+                    procedures.extend(matches[:1])
+                    break
+    return procedures
+
+
+def adversarial_text(size):
+    """One long period-free sentence, then every synonym group after a period -
+    each regex retries from every word start of the long sentence (quadratic)"""
+    tail = ". cardiac stress treadmill mri ct echo scan monitor brain"
+    return ("a " * size)[:size - len(tail)] + tail
+
+
+def best_time(func, *args, repeat=3):
+    """Best wall time in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def large_catalog(size):
+    """Synthetic procedure catalog with `size` distinct multi-word synonyms"""
+    rng = random.Random(42)
+    groups = {}
+    for i in range(size):
+        name = " ".join("".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(2))
+        groups.setdefault(f"group{i // 10}", []).append(name)
+    return groups
+
+
+def main():
+    print("Adversarial inputs, default catalog")
+    print(f"{'chars':>6} {'legacy (ms)':>12} {'automaton (ms)':>15} {'speedup':>8}")
+    for size in SIZES:
+        text = adversarial_text(size)
+        assert legacy_find_mentions(text) == default_matcher.find_mentions(text)
+        legacy = best_time(legacy_find_mentions, text)
+        new = best_time(default_matcher.find_mentions, text)
+        print(f"{size:>6} {legacy:>12.2f} {new:>15.2f} {legacy / new:>7.1f}x")
+
+    groups = large_catalog(LARGE_CATALOG_SIZE)
+    started = time.perf_counter()
+    matcher = ProcedureMatcher(groups)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    text = adversarial_text(MAX_INPUT_LENGTH)
+    legacy = best_time(legacy_find_mentions, text, groups, repeat=1)
+    new = best_time(matcher.find_mentions, text)
+    print(f"\n{LARGE_CATALOG_SIZE} synonym catalog: build {build_ms:.0f} ms, "
+          f"{MAX_INPUT_LENGTH} chars legacy {legacy:.2f} ms vs automaton {new:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+# bench_suite.py - Latency percentiles and allocations for the preprocessing and engine hot paths
+# Runs offline against MockBackend; results are saved as JSON so runs can be compared over time
+# Run: python benchmarks/bench_suite.py [--iterations N] [--output FILE] [--compare OLD.json]
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from ai_engine import MedicalAuthorizationAI
+from config import MIN_INPUT_LENGTH, MAX_INPUT_LENGTH
+from model_backends import MockBackend
+from rate_limiter import RateLimiter
+from result_model import parse_result
+from ui_components import generate_text_summary
+from utils import (
+    sanitize_medical_input, clean_input, extract_age, extract_procedures, validate_input_flexible, normalize_case
+)
+
+INPUT_SIZES = [MIN_INPUT_LENGTH, 100, 500, 1000, 2500, MAX_INPUT_LENGTH]
+PROCEDURE_COUNTS = [1, 5, 10, 25, 50]
+ALLOCATION_SAMPLES = 25
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+PROCEDURE_NAMES = [
+    "CT scan of abdomen", "Colonoscopy", "Upper endoscopy", "PET scan", "Liver MRI",
+    "Cardiac event monitor", "Brain MRI with contrast", "Stress test", "Carotid doppler", "Echocardiogram",
+]
+FILLER = (
+    "History: HTN and DM for 10 years, former smoker. Symptoms: SOB on exertion and CP at rest, "
+    "worse over 3 weeks. Family: father had MI at 62. Lab: elevated troponin, low blood count. "
+)
+
+
+def make_case(variant, size=None, procedures=1):
+    """Case text with a numbered procedure list; distinct per variant so no cache ever hits"""
+    head = f"#{variant} Age: 58, Male\nComplaint: Chest pain for 3 weeks\n"
+    listing = "\nPROCEDURES REQUESTED:\n" + "\n".join(
+        f"{i + 1}. {PROCEDURE_NAMES[i % len(PROCEDURE_NAMES)]}" for i in range(procedures)
+    )
+    if size is None:
+        return head + FILLER + listing
+    if size <= len(head) + len(listing):
+        return (head + listing)[:size]
+    body_length = size - len(head) - len(listing)
+    body = (FILLER * (body_length // len(FILLER) + 1))[:body_length]
+    return head + body + listing
+
+
+def make_cleaned_case(variant, size=None, procedures=1):
+    """
+    normalize_case output of make_case, at most size characters long
+    Abbreviation expansion lengthens the text, so the raw case is shortened until the cleaned one fits -
+    otherwise the largest sizes would only time validation's early too-long return
+    """
+    raw_size = size
+    while True:
+        cleaned = normalize_case(make_case(variant, raw_size, procedures))
+        if size is None or len(cleaned) <= size:
+            return cleaned
+        raw_size = raw_size * size // len(cleaned)  # Expansion grows text roughly in proportion
+
+
+def make_result(procedures):
+    """Model-shaped result with the given number of procedures"""
+    decisions = ["APPROVED", "DENIED", "PENDING_ADDITIONAL_INFO"]
+    if procedures == 1:
+        return {
+            "decision": "APPROVED", "confidence": 120, "procedure_type": PROCEDURE_NAMES[0],
+            "clinical_indication": "Chest pain", "reasoning": "Meets criteria. " * 10,
+            "urgency": "URGENT", "estimated_cost": "MODERATE", "missing_info": [],
+            "alternatives": ["Stress test"], "guidelines_referenced": ["ACC/AHA"],
+        }
+    return {
+        "multiple_procedures": True,
+        "overall_summary": "Mixed decisions",
+        "procedures": [
+            {
+                "procedure_name": PROCEDURE_NAMES[i % len(PROCEDURE_NAMES)],
+                "decision": decisions[i % 3], "confidence": 70 + i % 40,
+                "reasoning": "Specific medical justification. " * 5,
+                "urgency": "ROUTINE", "estimated_cost": "HIGH",
+                "missing_info": ["Prior imaging"] if i % 3 == 2 else [],
+                "alternatives": [], "guidelines_referenced": ["ACR"],
+            }
+            for i in range(procedures)
+        ],
+    }
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure(func, make_args, iterations):
+    """Per-call wall times and tracemalloc allocation figures for func(*make_args(i))"""
+    arguments = [make_args(i) for i in range(iterations + ALLOCATION_SAMPLES)]
+
+    func(*arguments[0])  # Warm up imports and lazy state
+    timings = []
+    for args in arguments[:iterations]:
+        started = time.perf_counter_ns()
+        func(*args)
+        timings.append(time.perf_counter_ns() - started)
+
+    peaks, retained = [], []
+    tracemalloc.start()
+    for args in arguments[iterations:]:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        func(*args)
+        current, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - before)
+        retained.append(current - before)
+    tracemalloc.stop()
+
+    timings.sort()
+    return {
+        "iterations": iterations,
+        "p50_us": round(percentile(timings, 0.50) / 1000, 2),
+        "p95_us": round(percentile(timings, 0.95) / 1000, 2),
+        "p99_us": round(percentile(timings, 0.99) / 1000, 2),
+        "mean_us": round(sum(timings) / len(timings) / 1000, 2),
+        "peak_alloc_bytes": round(sum(peaks) / len(peaks)),
+        "retained_bytes": round(sum(retained) / len(retained)),
+    }
+
+
+def build_benchmarks(iterations):
+    """
+    (name, params, func, make_args) for every benchmark in the suite
+    Each benchmark draws its own case variants, so parse_case memoization from an
+    earlier benchmark never turns a measurement into a cache hit
+    """
+    bases = iter(range(0, 10 ** 9, iterations + ALLOCATION_SAMPLES + 1))
+    engine = MedicalAuthorizationAI(
+        backend=MockBackend(latency_median=0),
+        rate_limiter=RateLimiter(rpm=0, tpm=0),
+        cache=False,
+    )
+    if not engine.is_initialized:
+        raise RuntimeError(engine.error_message)
+
+    def cases(cleaned=False, **shape):
+        """Argument factory over a fresh block of case variants"""
+        base = next(bases)
+        if cleaned:
+            return lambda i: (make_cleaned_case(base + i, **shape),)
+        return lambda i: (make_case(base + i, **shape),)
+
+    benchmarks = []
+    for size in INPUT_SIZES:
+        params = {"chars": size, "procedures": 1}
+        benchmarks += [
+            ("sanitize_medical_input", params, sanitize_medical_input, cases(size=size)),
+            ("clean_input", params, clean_input, cases(size=size)),
+            ("extract_age", params, extract_age, cases(size=size)),
+            ("extract_procedures", params, extract_procedures, cases(size=size)),
+            ("validate_input_flexible", params, validate_input_flexible, cases(cleaned=True, size=size)),
+            ("_create_analysis_prompt", params, engine._create_analysis_prompt, cases(cleaned=True, size=size)),
+        ]
+
+    for count in PROCEDURE_COUNTS:
+        params = {"chars": len(make_case(0, procedures=count)), "procedures": count}
+        benchmarks += [
+            ("extract_procedures", params, extract_procedures, cases(procedures=count)),
+            ("_create_analysis_prompt", params, engine._create_analysis_prompt, cases(cleaned=True, procedures=count)),
+            ("parse_result", params, parse_result, lambda i, count=count: (json.dumps(make_result(count)),)),
+            ("generate_text_summary", params, generate_text_summary,
+             lambda i, count=count: (make_result(count), make_case(i, procedures=count))),
+            ("analyze_case", params, engine.analyze_case, cases(cleaned=True, procedures=count)),
+        ]
+    return benchmarks
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(previous_path, results):
+    """Print the p50 change against an earlier results file"""
+    with open(previous_path, "r", encoding="utf-8") as f:
+        previous = {(r["name"], r["chars"], r["procedures"]): r for r in json.load(f)["results"]}
+
+    print(f"\nChange vs {previous_path} (p50)")
+    for r in results:
+        old = previous.get((r["name"], r["chars"], r["procedures"]))
+        if old and old["p50_us"]:
+            change = (r["p50_us"] - old["p50_us"]) / old["p50_us"] * 100
+            print(f"{r['name']:<26}{r['chars']:>7}{r['procedures']:>6}{old['p50_us']:>12.1f}{r['p50_us']:>12.1f}{change:>+9.1f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark preprocessing and engine hot paths")
+    parser.add_argument("--iterations", type=int, default=200, help="Timed calls per benchmark")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    results = []
+    print(f"{'benchmark':<26}{'chars':>7}{'procs':>6}{'p50 us':>12}{'p95 us':>12}{'p99 us':>12}{'peak KiB':>10}")
+    for name, params, func, make_args in build_benchmarks(args.iterations):
+        stats = measure(func, make_args, args.iterations)
+        results.append({"name": name, **params, **stats})
+        print(f"{name:<26}{params['chars']:>7}{params['procedures']:>6}{stats['p50_us']:>12.1f}"
+              f"{stats['p95_us']:>12.1f}{stats['p99_us']:>12.1f}{stats['peak_alloc_bytes'] / 1024:>10.1f}")
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "iterations": args.iterations,
+        "backend": "mock (no latency)",
+        "results": results,
+    }
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nSaved {len(results)} results to {output}")
+
+    if args.compare:
+        compare(args.compare, results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,307 @@
+# case_store.py - Analyzed cases, procedure decisions and justifications in SQLite (WAL mode)
+# Sessions keep only a case ID; history survives restarts and is read back a page at a time
+
+import atexit
+import sqlite3
+import threading
+import time
+import uuid
+
+import json_codec
+from config import CASE_STORE_DB, CASE_STORE_BATCH_SIZE, CASE_STORE_FLUSH_SECONDS, CASE_STORE_PAGE_SIZE
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cases (
+    id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    session_id TEXT,
+    model TEXT,
+    case_text TEXT NOT NULL,
+    result_json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS cases_created ON cases (created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS cases_session ON cases (session_id, created_at DESC);
+
+CREATE TABLE IF NOT EXISTS procedure_decisions (
+    case_id TEXT NOT NULL REFERENCES cases (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    procedure_name TEXT,
+    decision TEXT,
+    confidence INTEGER,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (case_id, position)
+);
+CREATE INDEX IF NOT EXISTS procedure_decisions_decision ON procedure_decisions (decision, updated_at DESC);
+
+CREATE TABLE IF NOT EXISTS justifications (
+    id TEXT PRIMARY KEY,
+    case_id TEXT NOT NULL REFERENCES cases (id) ON DELETE CASCADE,
+    created_at REAL NOT NULL,
+    procedure_name TEXT,
+    justification_text TEXT,
+    original_decision TEXT,
+    new_decision TEXT,
+    ai_assessment TEXT,
+    decision_changed INTEGER
+);
+CREATE INDEX IF NOT EXISTS justifications_case ON justifications (case_id, created_at);
+"""
+
+_ANY_SESSION = object()  # Dirty marker for writes whose session is not known - every case list flushes first
+
+
+class CaseStore:
+    """
+    Writes are queued and committed in batches (one transaction per flush) by a background thread;
+    a read flushes first only when it touches a case (or a session's case list) with queued writes,
+    so callers still see their own writes without turning every read into a commit
+    """
+
+    def __init__(self, path=CASE_STORE_DB, batch_size=CASE_STORE_BATCH_SIZE, flush_seconds=CASE_STORE_FLUSH_SECONDS):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._local = threading.local()
+        self._pending = []  # (sql, params) in submission order
+        self._dirty_cases = set()  # Case IDs with queued writes
+        self._dirty_sessions = set()  # Session IDs whose case list has queued changes (_ANY_SESSION: unknown)
+        self._pending_lock = threading.Condition()
+        self._flush_lock = threading.Lock()
+        # Failures in the background writer, reported through health() like the metrics exporter's export_error
+        self.write_error = None  # Last failed flush (its batch is queued again); cleared by the next good flush
+        self.dropped_writes = 0  # Statements rejected for good (IntegrityError)
+        self.last_dropped = None
+
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+
+        self._writer = threading.Thread(target=self._write_forever, name="case-store-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.flush)
+
+    def _connect(self):
+        """One connection per thread - sqlite3 connections are not thread safe"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL, far fewer fsyncs
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    # Writes
+
+    def record_case(self, case_text, result, session_id=None, model=None):
+        """Queue a new case with its procedure decisions and return its ID"""
+        case_id = uuid.uuid4().hex
+        now = time.time()
+        self._submit(
+            [("INSERT INTO cases (id, created_at, session_id, model, case_text, result_json) VALUES (?, ?, ?, ?, ?, ?)",
+              (case_id, now, session_id, model, case_text, json_codec.dumps(result)))]
+            + self._decision_rows(case_id, result, now),
+            case_id, session_id
+        )
+        return case_id
+
+    def update_result(self, case_id, result):
+        """Queue the latest result for a case (after a justification changed a decision)"""
+        now = time.time()
+        self._submit(
+            [("UPDATE cases SET result_json = ? WHERE id = ?", (json_codec.dumps(result), case_id))]
+            + self._decision_rows(case_id, result, now),
+            case_id, _ANY_SESSION
+        )
+
+    def record_justification(self, case_id, procedure_name, justification_text, original_decision,
+                             new_decision, ai_assessment, decision_changed):
+        self._submit([(
+            "INSERT INTO justifications (id, case_id, created_at, procedure_name, justification_text, "
+            "original_decision, new_decision, ai_assessment, decision_changed) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (uuid.uuid4().hex, case_id, time.time(), procedure_name, justification_text, original_decision,
+             new_decision, ai_assessment, int(bool(decision_changed)))
+        )], case_id)
+
+    def delete_case(self, case_id, session_id=None):
+        """Queue a delete; with session_id only a case saved by that session is removed"""
+        if session_id is None:
+            self._submit([("DELETE FROM cases WHERE id = ?", (case_id,))], case_id, _ANY_SESSION)
+        else:
+            self._submit([("DELETE FROM cases WHERE id = ? AND session_id = ?", (case_id, session_id))],
+                         case_id, session_id)
+
+    def _decision_rows(self, case_id, result, now):
+        procedures = result.get('procedures', []) if result.get('multiple_procedures') else [result]
+        return [
+            ("INSERT OR REPLACE INTO procedure_decisions "
+             "(case_id, position, procedure_name, decision, confidence, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+             (case_id, position, procedure.get('procedure_name') or procedure.get('procedure_type'),
+              procedure.get('decision'), procedure.get('confidence'), now))
+            for position, procedure in enumerate(procedures)
+        ]
+
+    def _submit(self, statements, case_id, session_id=None):
+        with self._pending_lock:
+            self._pending.extend(statements)
+            self._dirty_cases.add(case_id)
+            self._dirty_sessions.add(session_id)
+            if len(self._pending) >= self.batch_size:
+                self._pending_lock.notify()
+
+    def _requeue(self, statements, dirty_cases, dirty_sessions):
+        """Put unwritten statements back in front of anything queued since, so a retry keeps the order"""
+        with self._pending_lock:
+            self._pending[:0] = statements
+            self._dirty_cases |= dirty_cases
+            self._dirty_sessions |= dirty_sessions
+
+    def _needs_flush(self, case_id=None, session_id=_ANY_SESSION):
+        """True when a read of this case (or of this session's case list) could miss a queued write"""
+        with self._pending_lock:
+            if case_id is not None:
+                return case_id in self._dirty_cases
+            if session_id is _ANY_SESSION:
+                return bool(self._dirty_sessions)
+            return session_id in self._dirty_sessions or _ANY_SESSION in self._dirty_sessions
+
+    def flush(self):
+        """
+        Commit everything queued so far in one transaction
+        On a database error other than a bad row (e.g. locked past the timeout) the batch is queued again
+        """
+        with self._flush_lock:
+            with self._pending_lock:
+                batch, self._pending = self._pending, []
+                dirty_cases, self._dirty_cases = self._dirty_cases, set()
+                dirty_sessions, self._dirty_sessions = self._dirty_sessions, set()
+            if not batch:
+                return 0
+
+            conn = self._connect()
+            try:
+                self._execute(conn, batch)
+            except sqlite3.IntegrityError:
+                # One bad row (e.g. a justification for a case deleted meanwhile) must not sink the batch
+                for position, statement in enumerate(batch):
+                    try:
+                        self._execute(conn, [statement])
+                    except sqlite3.IntegrityError as e:
+                        self.dropped_writes += 1
+                        self.last_dropped = f"Case store dropped a write: {e}"
+                    except sqlite3.Error as e:
+                        self._requeue(batch[position:], dirty_cases, dirty_sessions)
+                        self.write_error = f"Case store write failed, retrying: {e}"
+                        raise
+            except sqlite3.Error as e:
+                self._requeue(batch, dirty_cases, dirty_sessions)
+                self.write_error = f"Case store write failed, retrying: {e}"
+                raise
+            self.write_error = None
+            return len(batch)
+
+    def _execute(self, conn, statements):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for sql, params in statements:
+                conn.execute(sql, params)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _write_forever(self):
+        while True:
+            with self._pending_lock:
+                self._pending_lock.wait(self.flush_seconds)
+            try:
+                self.flush()
+            except sqlite3.Error:
+                pass  # Recorded in write_error; the batch was queued again for the next cycle
+
+    def health(self):
+        """Writer state for the status panel and the API's /health"""
+        with self._pending_lock:
+            pending = len(self._pending)
+        return {"pending_writes": pending, "write_error": self.write_error,
+                "dropped_writes": self.dropped_writes, "last_dropped": self.last_dropped}
+
+    # Reads
+
+    def get_case(self, case_id):
+        """Case text and latest result, or None"""
+        if self._needs_flush(case_id=case_id):
+            self.flush()
+        row = self._connect().execute(
+            "SELECT id, created_at, session_id, model, case_text, result_json FROM cases WHERE id = ?", (case_id,)
+        ).fetchone()
+        return _case_dict(row) if row else None
+
+    def list_cases(self, limit=CASE_STORE_PAGE_SIZE, before=None, session_id=None):
+        """
+        One page of cases, newest first, without case text
+        Keyset pagination - pass the returned cursor as before for the next page
+        Returns (cases, next_cursor); next_cursor is None on the last page
+        """
+        if self._needs_flush(session_id=_ANY_SESSION if session_id is None else session_id):
+            self.flush()
+        where, params = [], []
+        if session_id is not None:
+            where.append("session_id = ?")
+            params.append(session_id)
+        if before is not None:
+            where.append("(created_at, id) < (?, ?)")
+            params.extend(before)
+
+        rows = self._connect().execute(
+            "SELECT id, created_at, session_id, model, result_json FROM cases"
+            + (" WHERE " + " AND ".join(where) if where else "")
+            + " ORDER BY created_at DESC, id DESC LIMIT ?",
+            params + [limit + 1]
+        ).fetchall()
+
+        cases = [_case_dict(row) for row in rows[:limit]]
+        next_cursor = (cases[-1]['created_at'], cases[-1]['id']) if len(rows) > limit else None
+        return cases, next_cursor
+
+    def list_justifications(self, case_id):
+        """Justification rounds for a case, oldest first"""
+        if self._needs_flush(case_id=case_id):
+            self.flush()
+        rows = self._connect().execute(
+            "SELECT created_at, procedure_name, justification_text, original_decision, new_decision, "
+            "ai_assessment, decision_changed FROM justifications WHERE case_id = ? ORDER BY created_at",
+            (case_id,)
+        ).fetchall()
+        return [
+            dict(row, decision_changed=bool(row['decision_changed']),
+                 timestamp=time.strftime("%m/%d %H:%M", time.localtime(row['created_at'])))
+            for row in rows
+        ]
+
+    def count_justifications(self, case_id):
+        if self._needs_flush(case_id=case_id):
+            self.flush()
+        return self._connect().execute(
+            "SELECT COUNT(*) FROM justifications WHERE case_id = ?", (case_id,)
+        ).fetchone()[0]
+
+
+def _case_dict(row):
+    case = dict(row)
+    case['result'] = json_codec.loads(case.pop('result_json'))
+    case['timestamp'] = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(case['created_at']))
+    return case
+
+
+_shared_store = None
+_shared_lock = threading.Lock()
+
+
+def get_case_store():
+    """Process-wide store used by every session"""
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = CaseStore()
+        return _shared_store
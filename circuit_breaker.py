@@ -0,0 +1,143 @@
+# circuit_breaker.py - Stop calling a degraded model backend instead of retrying into it
+# closed -> open when the recent error rate crosses the threshold, open -> half_open after a cool-down,
+# half_open -> closed once probe calls succeed (or straight back to open when a probe fails)
+# Every transition starts a new generation; an outcome only counts in the generation its call was admitted in
+
+import threading
+import time
+from collections import deque
+
+from config import (
+    BREAKER_ERROR_RATE, BREAKER_WINDOW, BREAKER_MIN_CALLS, BREAKER_OPEN_SECONDS, BREAKER_HALF_OPEN_PROBES
+)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the backend while the breaker is open"""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Model service temporarily unavailable - retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Error-rate breaker over the last `window` backend calls"""
+
+    def __init__(self, error_rate=BREAKER_ERROR_RATE, window=BREAKER_WINDOW, min_calls=BREAKER_MIN_CALLS,
+                 open_seconds=BREAKER_OPEN_SECONDS, half_open_probes=BREAKER_HALF_OPEN_PROBES):
+        self.error_rate = error_rate
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=window)  # True for a failed call
+        self._state = CLOSED
+        self._generation = 1  # Tokens are never falsy
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self._times_opened = 0
+        self._rejected = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def allow(self):
+        """
+        Admission token when a call may go to the backend now, else None
+        Callers must hand the token back with the call's outcome (record_success/record_failure/release)
+        """
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            if state == CLOSED:
+                return self._generation
+            if state == HALF_OPEN and self._probes_in_flight < self.half_open_probes:
+                self._probes_in_flight += 1
+                return self._generation
+            self._rejected += 1
+            return None
+
+    def retry_after(self):
+        """Seconds until the breaker lets a probe through (0 when not open)"""
+        with self._lock:
+            if self._current_state(time.monotonic()) != OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self.open_seconds - time.monotonic())
+
+    def record_success(self, admission):
+        with self._lock:
+            if not self._current_admission(admission):
+                return  # Admitted under an earlier state - says nothing about the current one
+            if self._state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_probes:
+                    # Upstream has recovered - start over with a clean window
+                    self._state = CLOSED
+                    self._generation += 1
+                    self._outcomes.clear()
+                return
+            self._outcomes.append(False)
+
+    def release(self, admission):
+        """An admitted call ended without an outcome (cancelled) - free its probe slot"""
+        with self._lock:
+            if self._current_admission(admission) and self._state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def record_failure(self, admission):
+        with self._lock:
+            now = time.monotonic()
+            if not self._current_admission(admission, now):
+                return  # e.g. a call admitted before the breaker opened
+            if self._state == HALF_OPEN:
+                self._open(now)
+                return
+            self._outcomes.append(True)
+            calls = len(self._outcomes)
+            if calls >= self.min_calls and sum(self._outcomes) / calls >= self.error_rate:
+                self._open(now)
+
+    def stats(self):
+        """State and counters for the status panel"""
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            calls = len(self._outcomes)
+            return {
+                "state": state,
+                "error_rate": round(sum(self._outcomes) / calls, 3) if calls else 0.0,
+                "window_calls": calls,
+                "times_opened": self._times_opened,
+                "rejected": self._rejected,
+                "retry_after_seconds": round(max(0.0, self._opened_at + self.open_seconds - now), 1)
+                if state == OPEN else 0.0,
+            }
+
+    def _current_admission(self, admission, now=None):
+        """True when the call was admitted in the current generation (lock held)"""
+        self._current_state(time.monotonic() if now is None else now)
+        return admission == self._generation
+
+    def _open(self, now):
+        self._state = OPEN
+        self._generation += 1
+        self._opened_at = now
+        self._times_opened += 1
+        self._outcomes.clear()
+
+    def _current_state(self, now):
+        """State, moving open -> half_open once the cool-down has passed (lock held)"""
+        if self._state == OPEN and now - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._generation += 1
+            self._probes_in_flight = 0
+            self._probe_successes = 0
+        return self._state
@@ -1,9 +1,87 @@
 # config.py - All settings and constants in one place
 
 # API Configuration
+MODEL_BACKEND = 'gemini'  # 'mock' runs fully offline (benchmarks, load tests, CI)
 GEMINI_MODEL = 'gemini-1.5-flash'
 MAX_RETRIES = 3
 API_TIMEOUT = 30
+ASYNC_MAX_CONCURRENCY = 32  # In-flight model calls per event loop for the async API
+
+# Proactive rate limiting - match these to your Gemini API tier
+GEMINI_RPM_LIMIT = 15  # Requests per minute (0 disables)
+GEMINI_TPM_LIMIT = 1000000  # Tokens per minute (0 disables)
+RATE_LIMIT_DB = None  # e.g. "/tmp/msa_rate_limit.db" so every process on the host shares one budget
+
+# Circuit breaker - stop retrying into a degraded backend
+BREAKER_ENABLED = True
+BREAKER_ERROR_RATE = 0.5  # Open when this share of recent calls failed...
+BREAKER_WINDOW = 20  # ...over the last this many calls
+BREAKER_MIN_CALLS = 5  # Never open on fewer calls than this
+BREAKER_OPEN_SECONDS = 30  # Fail fast (or use the fallback) this long before probing again
+BREAKER_HALF_OPEN_PROBES = 1  # Successful probes needed to close again
+FALLBACK_MODEL = None  # e.g. 'gemini-1.5-flash-8b' to serve requests while the breaker is open
+
+# Generation settings - zero temperature for consistent medical decisions
+GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "temperature": 0,
+    "max_output_tokens": 4000
+}
+
+# Bump whenever the analysis prompt changes so cached decisions are not reused
+PROMPT_TEMPLATE_VERSION = "3"
+
+# Register the static analysis instructions once with Gemini context caching
+# (falls back to a system instruction when the model or SDK doesn't support it)
+PROMPT_CONTEXT_CACHE = True
+PROMPT_CACHE_TTL_SECONDS = 60 * 60
+
+# Mock backend - log-normal latency around the median plus injected failures
+MOCK_LATENCY_SECONDS = 0.8  # Median latency per call (0 = no sleeping)
+MOCK_LATENCY_SIGMA = 0.35
+MOCK_ERROR_RATE = 0.0  # Share of calls failing with a 500
+MOCK_RATE_LIMIT_RATE = 0.0  # Share of calls failing with a 429
+MOCK_SEED = 0
+
+# Fan-out mode - itemized multi-procedure requests go out as one concurrent call per procedure
+ANALYSIS_FANOUT = False
+FANOUT_MIN_PROCEDURES = 2  # Smaller requests keep the single combined call
+FANOUT_MAX_WORKERS = 8  # Concurrent per-procedure calls for one case
+
+# Decision cache - repeat cases skip the model round trip
+DECISION_CACHE_ENABLED = True
+DECISION_CACHE_MAX_ENTRIES = 256
+DECISION_CACHE_TTL_SECONDS = 24 * 60 * 60
+DECISION_CACHE_DIR = None  # e.g. ".cache/decisions" to keep decisions across restarts
+
+# Justification rounds - the case context is built once per procedure, earlier rounds are compacted
+JUSTIFICATION_RECENT_ROUNDS = 2  # Rounds quoted verbatim (trimmed) in the next prompt
+JUSTIFICATION_ROUND_CHARS = 800  # Per quoted round
+JUSTIFICATION_SUMMARY_CHARS = 1200  # One line per older round; the oldest lines drop off past this
+JUSTIFICATION_SESSIONS_MAX = 256  # Open sessions per engine (least recently used are dropped)
+JUSTIFICATION_WORKERS = 4  # Background threads running justification rounds for all sessions
+JUSTIFICATION_INBOXES_MAX = 512  # Sessions with uncollected outcomes (oldest dropped - the case store keeps the history)
+JUSTIFICATION_POLL_SECONDS = 1.0  # How often a waiting page checks its inbox
+JUSTIFICATION_RESULTS_KEPT = 20  # Outcomes kept in a session's notification list
+
+# Case store - analyzed cases, decisions and justifications (sessions keep only the case ID)
+CASE_STORE_DB = "case_store.db"  # SQLite file, WAL mode
+CASE_STORE_BATCH_SIZE = 100  # Queued statements that trigger an early flush
+CASE_STORE_FLUSH_SECONDS = 1.0  # Queued writes are committed at least this often
+CASE_STORE_PAGE_SIZE = 10  # Cases per page in the saved cases view
+
+# Exports - receipts and JSON downloads are built on request and reused until the case changes
+EXPORT_CACHE_MAX_ENTRIES = 64  # Built artifacts kept across sessions (least recently used are dropped)
+
+# JSON codec for model responses, exports and the case store
+JSON_CODEC = 'auto'  # 'auto' uses orjson when installed, 'orjson' requires it, 'stdlib' forces the json module
+
+# Metrics - latency, retries, validation failures and token usage in Prometheus text format
+METRICS_ENABLED = False
+METRICS_PORT = None  # e.g. 9108 to serve http://host:9108/metrics
+METRICS_HOST = "127.0.0.1"  # Interface the metrics endpoint binds to - "0.0.0.0" to let other hosts scrape it
+METRICS_FILE = None  # e.g. "/var/lib/node_exporter/msa.prom" for a textfile collector
+METRICS_EXPORT_INTERVAL = 15  # Seconds between metrics file rewrites
 
 # Input Validation 
 MIN_INPUT_LENGTH = 15  
@@ -20,6 +98,18 @@ AGE_PATTERNS = [
     r'\b(\d{1,2})s\b',                               # "60s" = 60-69
 ]
 
+# Medical abbreviations expanded by clean_input (case insensitive, whole words)
+MEDICAL_ABBREVIATIONS = {
+    'abd': 'abdomen',
+    'htn': 'hypertension', 
+    'dm': 'diabetes mellitus',
+    'mi': 'myocardial infarction',
+    'sob': 'shortness of breath',
+    'cp': 'chest pain',
+    'yo': 'years old',
+    'y.o.': 'years old'
+}
+
 # Procedure synonyms - Help with flexible input
 PROCEDURE_SYNONYMS = {
     'heart': ['cardiac', 'cardio', 'heart', 'coronary'],
@@ -32,6 +122,20 @@ PROCEDURE_SYNONYMS = {
     'ultrasound': ['ultrasound', 'echo', 'sonogram', 'doppler']
 }
 
+# Case section labels - canonical name -> labels accepted in the input (case insensitive)
+CASE_SECTION_LABELS = {
+    'Age': ['age'],
+    'Complaint': ['chief complaint', 'complaint'],
+    'History': ['past medical history', 'medical history', 'history'],
+    'Family': ['family history', 'family'],
+    'Symptoms': ['symptoms'],
+    'Lab': ['labs', 'lab'],
+    'Exam': ['physical exam', 'exam'],
+    'Previous Tests': ['previous tests'],
+    'Procedures': ['procedures requested', 'requested procedures', 'procedures', 'procedure']
+}
+PARSED_CASE_CACHE_SIZE = 128  # Distinct case texts kept parsed (one per keystroke rerun)
+
 # Example cases for the sidebar
 EXAMPLE_CASES = {
     "Heart Monitor": """Age: 60s, Male
@@ -68,10 +172,27 @@ PROCEDURES REQUESTED:
 5. Liver MRI"""
 }
 
+# HTTP API (api_server.py)
+API_HOST = "127.0.0.1"
+API_PORT = 8000
+API_MAX_IN_FLIGHT = 256  # Requests being processed at once per process
+API_MAX_QUEUED = 1024  # Requests waiting for a slot; beyond this the API answers 429 right away
+API_MAX_BODY_BYTES = 64 * 1024
+API_IDEMPOTENCY_TTL_SECONDS = 24 * 60 * 60  # How long a completed response is replayed for its Idempotency-Key
+API_IDEMPOTENCY_MAX_KEYS = 10000
+
+# Batch runner
+BATCH_WORKERS = 8  # Concurrent cases in flight for batch_runner.py
+
 # UI Configuration
 APP_TITLE = "Medical Support Authorization AI"
 APP_SUBTITLE = "Instant, Evidence-Based Procedure Authorization Decisions"
 
+# Static assets - merged, minified and hashed once per process, injected once per browser session
+ASSET_STYLESHEETS = ["styles.css", "assets/header.css", "assets/input.css", "assets/diagnosis.css"]  # In cascade order
+ASSET_IMAGES = {"logo": "images/cloudsolutions-logo.png"}  # Referenced from CSS as url("asset:<name>")
+FAVICON_PATH = "images/cloudsolutions-logo.png"
+
 # Color scheme
 COLORS = {
     'approved': '#059669',
@@ -0,0 +1,179 @@
+# decision_cache.py - Content-addressed cache for authorization decisions
+
+import copy
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+import json_codec
+
+
+def canonicalize_case_text(text):
+    """Normalize case text so trivially different submissions share a key"""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFC", text)
+    return " ".join(text.split())
+
+
+def make_cache_key(case_text, model_name, generation_config, prompt_version):
+    """Build a stable hash from the case text and everything that shapes the answer"""
+    payload = json.dumps(
+        {
+            "case": canonicalize_case_text(case_text),
+            "model": model_name,
+            "generation_config": generation_config or {},
+            "prompt_version": prompt_version,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class DecisionCache:
+    """
+    LRU + TTL cache for analyze_case results
+    Memory tier is always on, disk tier is optional and survives restarts
+    """
+
+    def __init__(self, max_entries=256, ttl_seconds=86400, cache_dir=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.cache_dir = cache_dir
+        self._entries = OrderedDict()  # key -> (stored_at, result)
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "evictions": 0,
+            "expirations": 0,
+        }
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def get(self, key):
+        """Return a copy of the cached result, or None on a miss"""
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, result = entry
+                if self._is_fresh(stored_at, now):
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    self._stats["memory_hits"] += 1
+                    return copy.deepcopy(result)
+
+                # Expired - drop it and fall through to the disk tier
+                del self._entries[key]
+                self._stats["expirations"] += 1
+
+        entry = self._read_disk(key)
+        if entry is not None:
+            stored_at, result = entry
+            if self._is_fresh(stored_at, now):
+                with self._lock:
+                    self._remember(key, stored_at, result)
+                    self._stats["hits"] += 1
+                    self._stats["disk_hits"] += 1
+                return copy.deepcopy(result)
+
+            self._delete_disk(key)
+            with self._lock:
+                self._stats["expirations"] += 1
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    def set(self, key, result):
+        """Store a successful result in memory and, if enabled, on disk"""
+        stored_at = time.time()
+        result = copy.deepcopy(result)
+
+        with self._lock:
+            self._remember(key, stored_at, result)
+
+        self._write_disk(key, stored_at, result)
+
+    def clear(self):
+        """Drop every cached decision (both tiers)"""
+        with self._lock:
+            self._entries.clear()
+
+        if self.cache_dir:
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".json"):
+                    self._delete_path(os.path.join(self.cache_dir, name))
+
+    def stats(self):
+        """Get hit/miss counters and current size"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
+
+    def _is_fresh(self, stored_at, now):
+        """Check an entry against the TTL (None/0 means never expire)"""
+        return not self.ttl_seconds or now - stored_at < self.ttl_seconds
+
+    def _remember(self, key, stored_at, result):
+        """Insert into the memory tier and evict the oldest entries - caller holds the lock"""
+        self._entries[key] = (stored_at, result)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _read_disk(self, key):
+        """Load an entry from the disk tier"""
+        if not self.cache_dir:
+            return None
+
+        try:
+            with open(self._disk_path(key), "rb") as f:
+                data = json_codec.loads(f.read())
+            return data["stored_at"], data["result"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _write_disk(self, key, stored_at, result):
+        """Write an entry atomically so concurrent readers never see partial files"""
+        if not self.cache_dir:
+            return
+
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(json_codec.dumps_bytes({"stored_at": stored_at, "result": result}))
+            os.replace(tmp_path, self._disk_path(key))
+        except (OSError, TypeError, ValueError):
+            # Disk tier is best effort - the memory tier still has the entry
+            pass
+
+    def _delete_disk(self, key):
+        if self.cache_dir:
+            self._delete_path(self._disk_path(key))
+
+    def _delete_path(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
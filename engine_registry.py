@@ -0,0 +1,58 @@
+# engine_registry.py - One shared MedicalAuthorizationAI per model/config for the whole process
+
+import json
+import threading
+
+from ai_engine import MedicalAuthorizationAI
+from config import GEMINI_MODEL, GENERATION_CONFIG
+
+_engines = {}
+_lock = threading.Lock()
+
+
+def _registry_key(model_name, generation_config):
+    """Engines are shared between callers that ask for the same model and config"""
+    return model_name, json.dumps(generation_config or GENERATION_CONFIG, sort_keys=True)
+
+
+def get_engine(model_name=GEMINI_MODEL, generation_config=None):
+    """
+    Get the shared engine for this model/config, building it on first use
+    A failed engine is rebuilt on the next call so a fixed API key is picked up
+    """
+    key = _registry_key(model_name, generation_config)
+
+    engine = _engines.get(key)
+    if engine is not None and engine.is_initialized:
+        return engine
+
+    with _lock:
+        engine = _engines.get(key)
+        if engine is None or not engine.is_initialized:
+            engine = MedicalAuthorizationAI(model_name=model_name, generation_config=generation_config)
+            _engines[key] = engine
+        return engine
+
+
+def engine_health(model_name=GEMINI_MODEL, generation_config=None):
+    """Cheap health flag for the UI - never builds an engine"""
+    engine = _engines.get(_registry_key(model_name, generation_config))
+    if engine is None:
+        return {"built": False, "initialized": False, "model": model_name, "error": None,
+                "breaker": None, "fallback_model": None, "metrics_error": None}
+
+    return {
+        "built": True,
+        "initialized": engine.is_initialized,
+        "model": engine.model_name,
+        "error": engine.error_message or None,
+        "breaker": engine.breaker.stats() if engine.breaker is not None else None,
+        "fallback_model": engine.fallback_model,
+        "metrics_error": engine.metrics.export_error
+    }
+
+
+def reset_engines():
+    """Drop every shared engine (used after configuration changes)"""
+    with _lock:
+        _engines.clear()
@@ -0,0 +1,85 @@
+# export_cache.py - Built export artifacts (receipt text, JSON download) shared across reruns and sessions
+# An artifact is only built when an export is requested, and again only once the result or its justifications change
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import json_codec
+from config import EXPORT_CACHE_MAX_ENTRIES
+
+
+def result_digest(result):
+    """Content hash of a result dict - changes whenever a decision is updated"""
+    return hashlib.blake2b(json_codec.dumps_bytes(result), digest_size=16).hexdigest()
+
+
+def export_key(kind, case_id, result, justification_version):
+    """justification_version is anything that grows with each round (the round count)"""
+    return kind, case_id, result_digest(result), justification_version
+
+
+class ExportCache:
+    """LRU of built artifacts; concurrent requests for the same missing artifact build it once"""
+
+    def __init__(self, max_entries=EXPORT_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> artifact
+        self._building = {}  # key -> lock held while the artifact is built
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "builds": 0, "evictions": 0}
+
+    def get_or_build(self, key, build):
+        """Cached artifact for key, or build() it now"""
+        with self._lock:
+            artifact = self._lookup(key)
+            if artifact is not None:
+                return artifact
+            build_lock = self._building.setdefault(key, threading.Lock())
+
+        with build_lock:
+            with self._lock:
+                artifact = self._lookup(key)
+                if artifact is not None:
+                    return artifact
+            try:
+                artifact = build()
+                with self._lock:
+                    self._stats["builds"] += 1
+                    self._entries[key] = artifact
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+                        self._stats["evictions"] += 1
+            finally:
+                # Also after a failed build - waiters retry it themselves and the key doesn't leak
+                with self._lock:
+                    if self._building.get(key) is build_lock:
+                        del self._building[key]
+            return artifact
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+        return stats
+
+    def _lookup(self, key):
+        """Caller holds the lock"""
+        artifact = self._entries.get(key)
+        if artifact is not None:
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+        return artifact
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_export_cache():
+    """Process-wide cache - every session exporting the same case state shares one build"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ExportCache()
+        return _shared_cache
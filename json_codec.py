@@ -0,0 +1,62 @@
+# json_codec.py - One JSON codec for responses, exports and storage
+# Uses orjson when it is installed (JSON_CODEC = 'auto'), the stdlib json module otherwise
+
+import json
+
+from config import JSON_CODEC
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson.JSONDecodeError subclasses this, so one except clause covers both codecs
+JSONDecodeError = json.JSONDecodeError
+
+
+def _select(preference):
+    if preference not in ('auto', 'orjson', 'stdlib'):
+        raise ValueError(f"JSON_CODEC must be 'auto', 'orjson' or 'stdlib', not {preference!r}")
+    if preference == 'orjson' and orjson is None:
+        raise ImportError("JSON_CODEC = 'orjson' but orjson is not installed (pip install orjson)")
+    return 'orjson' if preference != 'stdlib' and orjson is not None else 'stdlib'
+
+
+CODEC = _select(JSON_CODEC)
+
+
+if CODEC == 'orjson':
+    def loads(data):
+        """Decode str, bytes, bytearray or memoryview - bytes are parsed in place, never copied to a str"""
+        return orjson.loads(data)
+
+    def dumps_bytes(obj, indent=False):
+        """UTF-8 encoded JSON, non-ASCII kept as is"""
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+        except TypeError:
+            # Things orjson refuses but json accepts (non-str dict keys, ints past 64 bits)
+            return _stdlib_dumps(obj, indent).encode("utf-8")
+
+    def dumps(obj, indent=False):
+        return dumps_bytes(obj, indent).decode("utf-8")
+
+else:
+    def loads(data):
+        """Decode str, bytes, bytearray or memoryview"""
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+    def dumps_bytes(obj, indent=False):
+        """UTF-8 encoded JSON, non-ASCII kept as is"""
+        return _stdlib_dumps(obj, indent).encode("utf-8")
+
+    def dumps(obj, indent=False):
+        return _stdlib_dumps(obj, indent)
+
+
+def _stdlib_dumps(obj, indent):
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
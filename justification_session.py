@@ -0,0 +1,88 @@
+# justification_session.py - Conversation state for one procedure's justification rounds
+# The case context is built once; each round sends it as the same fixed prefix plus a bounded delta
+
+import threading
+from collections import deque
+
+from config import JUSTIFICATION_RECENT_ROUNDS, JUSTIFICATION_ROUND_CHARS, JUSTIFICATION_SUMMARY_CHARS
+
+
+class JustificationSession:
+    """
+    Original case, decision and reasoning for one procedure, plus what earlier rounds said
+    The last JUSTIFICATION_RECENT_ROUNDS rounds are kept (trimmed) verbatim; older ones are compacted
+    into one line each, and the oldest lines are dropped once the summary passes its budget
+    """
+
+    def __init__(self, original_case, decision_info):
+        self.procedure_name = _procedure_name(decision_info)
+        self.original_decision = decision_info.get('decision', 'DENIED')
+        self.rounds = 0
+        self._recent = deque()  # (round number, justification, result)
+        self._summary = deque()  # one compacted line per older round
+        self._omitted = 0
+        self._lock = threading.Lock()
+
+        # Identical for every round of this procedure
+        self.context = f"""
+CASE UNDER REVIEW:
+ORIGINAL CASE: {original_case}
+PROCEDURE: {self.procedure_name}
+ORIGINAL DECISION: {self.original_decision}
+ORIGINAL REASONING: {decision_info.get('reasoning', 'None provided')}
+"""
+
+    def build_prompt(self, decision_info, justification_text):
+        """Context plus this round's delta"""
+        with self._lock:
+            history = self._history()
+        return f"""{self.context}
+{history}CURRENT DECISION: {decision_info.get('decision', self.original_decision)}
+
+NEW JUSTIFICATION FROM PROVIDER: {justification_text}
+"""
+
+    def record(self, justification_text, result):
+        """Remember a completed round, compacting the oldest verbatim round into the summary"""
+        with self._lock:
+            self.rounds += 1
+            self._recent.append((self.rounds, justification_text, result))
+            while len(self._recent) > JUSTIFICATION_RECENT_ROUNDS:
+                self._summary.append(_summary_line(*self._recent.popleft()))
+            while self._summary and sum(len(line) + 1 for line in self._summary) > JUSTIFICATION_SUMMARY_CHARS:
+                self._summary.popleft()
+                self._omitted += 1
+
+    def _history(self):
+        if not self._recent and not self._summary:
+            return ""
+
+        lines = ["EARLIER JUSTIFICATION ROUNDS:"]
+        if self._omitted:
+            lines.append(f"({self._omitted} earlier rounds omitted)")
+        lines.extend(self._summary)
+        for number, justification, result in self._recent:
+            lines.append(f"Round {number} justification: {_clip(justification, JUSTIFICATION_ROUND_CHARS)}")
+            lines.append(f"Round {number} outcome: {result.get('new_decision')} - "
+                         f"{_clip(result.get('justification_assessment', ''), JUSTIFICATION_ROUND_CHARS // 2)}")
+            if result.get('still_needed'):
+                lines.append(f"Round {number} still needed: {'; '.join(map(str, result['still_needed']))}")
+        return "\n".join(lines) + "\n\n"
+
+
+def session_key(case_hash, decision_info):
+    """Sessions are per case and procedure - the decision itself changes between rounds"""
+    return case_hash, _procedure_name(decision_info)
+
+
+def _procedure_name(decision_info):
+    return decision_info.get('procedure_name') or decision_info.get('procedure_type') or 'Requested procedure'
+
+
+def _summary_line(number, justification, result):
+    return f"Round {number}: {_clip(justification, 160)} -> {result.get('new_decision')}"
+
+
+def _clip(text, limit):
+    text = " ".join(str(text or "").split())
+    return text if len(text) <= limit else text[:limit - 3].rstrip() + "..."
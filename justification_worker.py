@@ -0,0 +1,153 @@
+# justification_worker.py - Justification rounds run off the Streamlit script thread
+# Each session has an inbox; outcomes wait there (and in the case store) until the session's next run picks them up
+
+import copy
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from case_store import get_case_store
+from config import JUSTIFICATION_WORKERS, JUSTIFICATION_INBOXES_MAX
+
+_CASE_LOCK_STRIPES = 64
+# Read-modify-write of one case's result is serialized process-wide; striped so the lock table never grows
+_CASE_LOCKS = [threading.Lock() for _ in range(_CASE_LOCK_STRIPES)]
+
+
+class JustificationWorker:
+    """
+    submit() returns at once; the model call and the case store writes happen on a worker thread
+    collect() hands a session the outcomes that finished since its last run
+    """
+
+    def __init__(self, max_workers=JUSTIFICATION_WORKERS, store=None):
+        self.store = store if store is not None else get_case_store()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="justify")
+        self._lock = threading.Lock()
+        self._inboxes = OrderedDict()  # session_id -> deque of outcomes (sessions that never come back age out)
+        self._pending = {}  # session_id -> rounds still running
+
+    def submit(self, session_id, engine, case_id, original_case, procedure_data, justification_text, index=None):
+        """Queue one justification round; the procedure dict is copied, the caller's stays untouched"""
+        with self._lock:
+            self._pending[session_id] = self._pending.get(session_id, 0) + 1
+        return self._executor.submit(
+            self._run, session_id, engine, case_id, original_case, copy.deepcopy(procedure_data),
+            justification_text, index
+        )
+
+    def pending(self, session_id):
+        """Rounds submitted by this session that have not finished yet"""
+        with self._lock:
+            return self._pending.get(session_id, 0)
+
+    def ready(self, session_id):
+        """True when collect() has something for this session"""
+        with self._lock:
+            return bool(self._inboxes.get(session_id))
+
+    def collect(self, session_id):
+        """Finished outcomes for this session, oldest first (each is handed out once)"""
+        with self._lock:
+            inbox = self._inboxes.pop(session_id, None)
+        return list(inbox) if inbox else []
+
+    def _run(self, session_id, engine, case_id, original_case, procedure_data, justification_text, index):
+        procedure_name = procedure_data.get('procedure_name') or procedure_data.get('procedure_type') or 'Requested procedure'
+        original_decision = procedure_data.get('decision')
+        try:
+            outcome = self._justify(engine, case_id, original_case, procedure_data, procedure_name, justification_text, index)
+        except Exception as e:
+            outcome = {"error": f"Justification failed: {str(e)[:80]}", "decision_changed": False,
+                       "new_decision": original_decision}
+        outcome.update(
+            procedure_name=procedure_name,
+            justification_text=justification_text,
+            original_decision=original_decision,
+            timestamp=datetime.now().strftime("%m/%d %H:%M"),
+        )
+
+        with self._lock:
+            inbox = self._inboxes.get(session_id)
+            if inbox is None:
+                inbox = self._inboxes[session_id] = deque()
+                while len(self._inboxes) > JUSTIFICATION_INBOXES_MAX:
+                    self._inboxes.popitem(last=False)
+            inbox.append(outcome)
+            remaining = self._pending.get(session_id, 1) - 1
+            if remaining:
+                self._pending[session_id] = remaining
+            else:
+                self._pending.pop(session_id, None)
+
+    def _justify(self, engine, case_id, original_case, procedure_data, procedure_name, justification_text, index):
+        result = engine.justify_case(original_case, procedure_data, justification_text)
+        if not result:
+            return {"error": "AI system returned no response. Please try again.", "decision_changed": False,
+                    "new_decision": procedure_data.get('decision')}
+        if result.get('error'):
+            # A failed model call is not a justification round - nothing is recorded
+            return {"error": result.get('justification_assessment') or result.get('reasoning'),
+                    "decision_changed": False, "new_decision": procedure_data.get('decision')}
+        return record_outcome(self.store, case_id, procedure_data, procedure_name, justification_text, index, result)
+
+
+def record_outcome(store, case_id, procedure_data, procedure_name, justification_text, index, result):
+    """
+    Store one finished round (history, plus the procedure itself when it was approved) and summarize it
+    Shared by the worker and the HTTP API, which runs the model call itself; procedure_data is updated in place
+    """
+    new_decision = result.get('new_decision', procedure_data.get('decision'))
+    decision_changed = result.get('decision_changed', False)
+
+    if case_id:
+        store.record_justification(
+            case_id, procedure_name, justification_text, procedure_data.get('decision'),
+            new_decision, result.get('justification_assessment', ''), decision_changed
+        )
+        # Only an approval updates the stored decision - other outcomes leave the procedure as it was
+        if decision_changed and new_decision == "APPROVED":
+            procedure_data['decision'] = new_decision
+            procedure_data['reasoning'] = result.get('reasoning', procedure_data.get('reasoning'))
+            procedure_data['confidence'] = result.get('confidence', procedure_data.get('confidence'))
+            _save_procedure(store, case_id, index, procedure_data)
+
+    return {
+        "error": None,
+        "new_decision": new_decision,
+        "decision_changed": decision_changed,
+        "assessment": result.get('justification_assessment', ''),
+        "still_needed": result.get('still_needed', []),
+        # Justification is per procedure; related procedures are never re-decided here
+        "approved_related_count": 0,
+        "approved_procedures": [],
+        "related_reasoning": "",
+    }
+
+
+def _save_procedure(store, case_id, index, procedure_data):
+    """Write one changed procedure back into the stored result"""
+    with _CASE_LOCKS[hash(case_id) % _CASE_LOCK_STRIPES]:
+        case = store.get_case(case_id)
+        if case is None:
+            return
+        result = case['result']
+        if index is not None and result.get('multiple_procedures'):
+            result['procedures'][index] = procedure_data
+        else:
+            result = procedure_data
+        store.update_result(case_id, result)
+
+
+_shared_worker = None
+_shared_lock = threading.Lock()
+
+
+def get_justification_worker():
+    """Process-wide worker shared by every session"""
+    global _shared_worker
+    with _shared_lock:
+        if _shared_worker is None:
+            _shared_worker = JustificationWorker()
+        return _shared_worker
@@ -0,0 +1,180 @@
+# metrics.py - Engine metrics (latency, retries, validation failures, tokens) in Prometheus text format
+# Disabled by default; every recording call returns on one attribute check when off
+
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import METRICS_ENABLED, METRICS_PORT, METRICS_HOST, METRICS_FILE, METRICS_EXPORT_INTERVAL
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+TOKEN_BUCKETS = (250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+WAIT_BUCKETS = (0, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60)  # 0 separates calls that never waited
+
+# name -> (type, help)
+METRIC_INFO = {
+    "msa_operation_seconds": ("histogram", "End-to-end engine operation latency including retries and cache hits"),
+    "msa_model_call_seconds": ("histogram", "Latency of individual model calls"),
+    "msa_model_attempts_total": ("counter", "Model call attempts by outcome (success or error class)"),
+    "msa_retries_total": ("counter", "Retries scheduled after a failed attempt, by error class"),
+    "msa_rate_limit_wait_seconds": ("histogram", "Time a model call waited for the shared RPM/TPM budget"),
+    "msa_breaker_rejections_total": ("counter", "Calls kept off the primary model by the open circuit breaker, by route"),
+    "msa_coalesced_requests_total": ("counter", "Requests answered by an identical call already in flight"),
+    "msa_validation_failures_total": ("counter", "Model responses rejected by schema validation"),
+    "msa_prompt_tokens_total": ("counter", "Prompt tokens reported by the model"),
+    "msa_response_tokens_total": ("counter", "Response tokens reported by the model"),
+    "msa_call_tokens": ("histogram", "Total tokens per model call"),
+}
+
+
+class MetricsRegistry:
+    """Thread-safe counters and fixed-bucket histograms"""
+
+    def __init__(self, enabled=METRICS_ENABLED):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._counters = {}    # (name, labels) -> value
+        self._histograms = {}  # (name, labels) -> [bucket counts..., sum, count]
+        self._buckets = {}     # name -> bucket bounds
+        self.export_error = None  # Last exporter failure, reported through the engine status like other errors
+
+    def inc(self, name, value=1, **labels):
+        """Add to a counter"""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, buckets=LATENCY_BUCKETS, **labels):
+        """Record one histogram observation"""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            series = self._histograms.get(key)
+            if series is None:
+                series = self._histograms[key] = [0] * (len(buckets) + 2)
+                self._buckets[name] = buckets
+            for index, bound in enumerate(buckets):
+                if value <= bound:
+                    series[index] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def render_prometheus(self):
+        """Everything recorded so far in Prometheus text exposition format"""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: list(series) for key, series in self._histograms.items()}
+            buckets = dict(self._buckets)
+
+        lines = []
+        for name, (kind, help_text) in METRIC_INFO.items():
+            if kind == "counter":
+                series = [(labels, value) for (metric, labels), value in counters.items() if metric == name]
+            else:
+                series = [(labels, value) for (metric, labels), value in histograms.items() if metric == name]
+            if not series:
+                continue
+
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in sorted(series):
+                if kind == "counter":
+                    lines.append(f"{name}{_format_labels(labels)} {value}")
+                    continue
+
+                cumulative = 0
+                for bound, count in zip(buckets[name], value):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', bound),))} {cumulative}")
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {value[-1]}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {round(value[-2], 6)}")
+                lines.append(f"{name}_count{_format_labels(labels)} {value[-1]}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{str(value)}"' for key, value in labels)
+    return "{" + pairs + "}"
+
+
+def write_metrics_file(registry, path):
+    """Write the current metrics atomically (for node_exporter's textfile collector and similar)"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(registry.render_prometheus())
+    os.replace(tmp_path, path)
+
+
+def start_file_exporter(registry, path, interval=METRICS_EXPORT_INTERVAL):
+    """Rewrite the metrics file every interval seconds from a daemon thread"""
+    def export_forever():
+        while True:
+            try:
+                write_metrics_file(registry, path)
+                registry.export_error = None
+            except OSError as e:
+                registry.export_error = f"Metrics file export failed: {e}"
+            time.sleep(interval)
+
+    thread = threading.Thread(target=export_forever, name="metrics-file-exporter", daemon=True)
+    thread.start()
+    return thread
+
+
+def start_http_exporter(registry, port, host=METRICS_HOST):
+    """Serve GET /metrics for Prometheus scraping from a daemon thread (loopback only by default)"""
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Scrapes every few seconds would flood the console
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, name="metrics-http-exporter", daemon=True)
+    thread.start()
+    return server
+
+
+_shared_metrics = None
+_shared_lock = threading.Lock()
+
+
+def get_metrics():
+    """Process-wide registry; starts the configured exporters on first use"""
+    global _shared_metrics
+    with _shared_lock:
+        if _shared_metrics is None:
+            _shared_metrics = MetricsRegistry()
+            if _shared_metrics.enabled:
+                if METRICS_PORT:
+                    try:
+                        start_http_exporter(_shared_metrics, METRICS_PORT, METRICS_HOST)
+                    except OSError as e:
+                        # Another process on this host already serves the port
+                        _shared_metrics.export_error = f"Metrics endpoint not started on port {METRICS_PORT}: {e}"
+                if METRICS_FILE:
+                    start_file_exporter(_shared_metrics, METRICS_FILE)
+        return _shared_metrics
@@ -0,0 +1,351 @@
+# model_backends.py - Model backends behind one small interface
+# GeminiBackend talks to the real API, MockBackend runs offline for benchmarks, load tests and CI
+
+import asyncio
+import hashlib
+import random
+import re
+import threading
+import time
+from functools import lru_cache
+
+import json_codec
+from config import (
+    PROMPT_CONTEXT_CACHE, MOCK_LATENCY_SECONDS, MOCK_LATENCY_SIGMA, MOCK_ERROR_RATE, MOCK_RATE_LIMIT_RATE, MOCK_SEED
+)
+
+
+class BackendResponse:
+    """
+    Body of one completed generation plus its token usage (0 when unknown)
+    body is whatever the backend produced - str, or UTF-8 bytes that the JSON codec decodes directly
+    """
+
+    __slots__ = ("body", "total_tokens", "prompt_tokens", "response_tokens")
+
+    def __init__(self, body, total_tokens=0, prompt_tokens=0, response_tokens=0):
+        self.body = body
+        self.total_tokens = total_tokens
+        self.prompt_tokens = prompt_tokens
+        self.response_tokens = response_tokens
+
+    @property
+    def text(self):
+        return self.body.decode("utf-8") if isinstance(self.body, (bytes, bytearray)) else self.body
+
+
+class BackendStream:
+    """Iterate for text chunks; token counts are filled in once the stream is consumed"""
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self.total_tokens = 0
+        self.prompt_tokens = 0
+        self.response_tokens = 0
+
+    def __iter__(self):
+        return iter(self._chunks(self))
+
+
+class ModelBackend:
+    """
+    Interface the engine calls through
+    instructions is the static system prompt (None for plain prompts like justifications)
+    """
+
+    name = "base"
+
+    def generate(self, prompt, instructions=None):
+        """Return a BackendResponse"""
+        raise NotImplementedError
+
+    async def generate_async(self, prompt, instructions=None):
+        """Async generate - runs the sync call in a worker thread unless overridden"""
+        return await asyncio.to_thread(self.generate, prompt, instructions)
+
+    def generate_stream(self, prompt, instructions=None):
+        """Return a BackendStream of text chunks"""
+        raise NotImplementedError
+
+    def count_tokens(self, text):
+        """Tokens the model would bill for text"""
+        return max(1, len(text or "") // 4)
+
+
+class GeminiBackend(ModelBackend):
+    """google-generativeai adapter"""
+
+    name = "gemini"
+
+    def __init__(self, api_key, model_name, generation_config):
+        import google.generativeai as genai
+
+        self._genai = genai
+        self.model_name = model_name
+        self.generation_config = generation_config
+
+        genai.configure(api_key=api_key)
+        self._plain_model = genai.GenerativeModel(model_name, generation_config=generation_config)
+        self._instruction_models = {}  # instructions -> model carrying them as system_instruction
+        self._cached_models = {}       # instructions version -> (cached content, model built from it)
+        self._lock = threading.Lock()
+
+    def generate(self, prompt, instructions=None):
+        response = self._model_for(instructions).generate_content(prompt)
+        return BackendResponse(response.text, *_usage(response))
+
+    async def generate_async(self, prompt, instructions=None):
+        response = await self._model_for(instructions).generate_content_async(prompt)
+        return BackendResponse(response.text, *_usage(response))
+
+    def generate_stream(self, prompt, instructions=None):
+        response = self._model_for(instructions).generate_content(prompt, stream=True)
+
+        def chunks(stream):
+            for chunk in response:
+                text = _chunk_text(chunk)
+                if text:
+                    yield text
+            stream.total_tokens, stream.prompt_tokens, stream.response_tokens = _usage(response)
+
+        return BackendStream(chunks)
+
+    def count_tokens(self, text):
+        return self._plain_model.count_tokens(text).total_tokens
+
+    def _model_for(self, instructions):
+        """
+        Plain model, or one carrying the static instructions - the context-cached copy
+        when Gemini accepts it, otherwise a system instruction as the local stand-in
+        """
+        if not instructions:
+            return self._plain_model
+
+        if PROMPT_CONTEXT_CACHE:
+            from prompt_cache import get_cached_instructions
+
+            version = _instructions_version(instructions)
+            cached = get_cached_instructions(self.model_name, instructions, version)
+            if cached is not None:
+                return self._cached_model(version, cached)
+
+        model = self._instruction_models.get(instructions)
+        if model is None:
+            with self._lock:
+                model = self._instruction_models.get(instructions)
+                if model is None:
+                    model = self._genai.GenerativeModel(
+                        self.model_name,
+                        generation_config=self.generation_config,
+                        system_instruction=instructions,
+                    )
+                    self._instruction_models[instructions] = model
+        return model
+
+    def _cached_model(self, version, cached):
+        known, model = self._cached_models.get(version, (None, None))
+        if known is not cached:
+            # First use, or the cache was re-registered after its TTL
+            model = self._genai.GenerativeModel.from_cached_content(
+                cached_content=cached,
+                generation_config=self.generation_config,
+            )
+            self._cached_models[version] = (cached, model)
+        return model
+
+
+@lru_cache(maxsize=32)
+def _instructions_version(instructions):
+    """Short content hash naming one set of instructions - analysis and justification get separate entries"""
+    return hashlib.sha256(instructions.encode("utf-8")).hexdigest()[:16]
+
+
+def _usage(response):
+    """(total, prompt, response) token counts from the usage metadata"""
+    usage = getattr(response, "usage_metadata", None)
+    if not usage:
+        return 0, 0, 0
+    return (
+        getattr(usage, "total_token_count", 0) or 0,
+        getattr(usage, "prompt_token_count", 0) or 0,
+        getattr(usage, "candidates_token_count", 0) or 0,
+    )
+
+
+def _chunk_text(chunk):
+    """Text of one streamed chunk - chunks without parts (e.g. the final one) have none"""
+    try:
+        return chunk.text
+    except ValueError:
+        return ""
+
+
+class MockBackendError(Exception):
+    """Injected failure - the message carries the HTTP status like the real client errors do"""
+
+
+_MOCK_DECISIONS = ("APPROVED", "DENIED", "PENDING_ADDITIONAL_INFO")
+_MOCK_PROCEDURES_RE = re.compile(r"- Procedures requested: (.*)")
+_MOCK_LIST_SPLIT_RE = re.compile(r";|(?:^|\s)\d+[.)]\s+")
+_MOCK_ONLY_RE = re.compile(r"Evaluate ONLY this procedure: (.*?)\. Use the single")
+
+
+class MockBackend(ModelBackend):
+    """
+    Offline backend returning schema-valid decisions
+    Decisions are a pure function of the prompt; latency and injected faults come from a
+    seeded generator, so a run is repeatable for the same seed and call order
+    """
+
+    name = "mock"
+
+    def __init__(self, latency_median=0.8, latency_sigma=0.35, error_rate=0.0, rate_limit_rate=0.0,
+                 stream_chunks=8, seed=0):
+        self.latency_median = latency_median    # seconds; 0 disables sleeping entirely
+        self.latency_sigma = latency_sigma      # log-normal spread
+        self.error_rate = error_rate            # share of calls failing with a 500
+        self.rate_limit_rate = rate_limit_rate  # share of calls failing with a 429
+        self.stream_chunks = stream_chunks
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def generate(self, prompt, instructions=None):
+        latency = self._next_call()
+        if latency:
+            time.sleep(latency)
+        return self._respond(prompt)
+
+    async def generate_async(self, prompt, instructions=None):
+        latency = self._next_call()
+        if latency:
+            await asyncio.sleep(latency)
+        return self._respond(prompt)
+
+    def generate_stream(self, prompt, instructions=None):
+        latency = self._next_call()
+        response = self._respond(prompt)
+        text = response.text
+        size = max(1, -(-len(text) // self.stream_chunks))
+
+        def chunks(stream):
+            for start in range(0, len(text), size):
+                if latency:
+                    time.sleep(latency / self.stream_chunks)
+                yield text[start:start + size]
+            stream.total_tokens = response.total_tokens
+            stream.prompt_tokens = response.prompt_tokens
+            stream.response_tokens = response.response_tokens
+
+        return BackendStream(chunks)
+
+    def _next_call(self):
+        """Draw this call's latency and raise any injected fault"""
+        with self._lock:
+            self.calls += 1
+            roll = self._random.random()
+            latency = self._random.lognormvariate(0, self.latency_sigma) * self.latency_median
+
+        if roll < self.rate_limit_rate:
+            raise MockBackendError("429 Resource has been exhausted (mock)")
+        if roll < self.rate_limit_rate + self.error_rate:
+            raise MockBackendError("500 Internal error (mock)")
+        return latency if self.latency_median else 0
+
+    def _respond(self, prompt):
+        result = self._decide(prompt)
+        body = json_codec.dumps_bytes(result)
+        prompt_tokens, response_tokens = self.count_tokens(prompt), self.count_tokens(body)
+        return BackendResponse(body, prompt_tokens + response_tokens, prompt_tokens, response_tokens)
+
+    def _decide(self, prompt):
+        if "NEW JUSTIFICATION FROM PROVIDER" in prompt:
+            decision = _mock_pick(prompt, _MOCK_DECISIONS)
+            return {
+                "new_decision": decision,
+                "confidence": _mock_confidence(prompt),
+                "justification_assessment": "Mock assessment of the new justification",
+                "reasoning": "Mock reasoning based on the new information",
+                "still_needed": [] if decision == "APPROVED" else ["Mock follow-up information"],
+                "decision_changed": decision == "APPROVED",
+            }
+
+        only = _MOCK_ONLY_RE.search(prompt)
+        listed = _MOCK_PROCEDURES_RE.search(prompt)
+        names = [only.group(1)] if only else [
+            name.strip() for name in (_MOCK_LIST_SPLIT_RE.split(listed.group(1)) if listed else []) if name.strip()
+        ]
+
+        if len(names) > 1:
+            procedures = [_mock_procedure(prompt, name) for name in names]
+            decisions = [procedure["decision"] for procedure in procedures]
+            return {
+                "multiple_procedures": True,
+                "overall_summary": "Mock summary of authorization decisions",
+                "total_procedures": len(procedures),
+                "approved_count": decisions.count("APPROVED"),
+                "denied_count": decisions.count("DENIED"),
+                "pending_count": decisions.count("PENDING_ADDITIONAL_INFO"),
+                "procedures": procedures,
+                "differential_diagnosis": _mock_differential(prompt),
+            }
+
+        result = _mock_procedure(prompt, names[0] if names else "Requested procedure")
+        result["procedure_type"] = result.pop("procedure_name")
+        result.update({
+            "clinical_indication": "Mock clinical indication",
+            "risk_factors": [],
+            "guidelines_referenced": ["Mock guideline"],
+            "alternatives": [],
+            "differential_diagnosis": _mock_differential(prompt),
+        })
+        return result
+
+
+def _mock_digest(*parts):
+    return int(hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()[:8], 16)
+
+
+def _mock_pick(prompt, choices, salt=""):
+    return choices[_mock_digest(prompt, salt) % len(choices)]
+
+
+def _mock_confidence(prompt, salt=""):
+    return 60 + _mock_digest(prompt, salt, "confidence") % 40
+
+
+def _mock_procedure(prompt, name):
+    decision = _mock_pick(prompt, _MOCK_DECISIONS, name)
+    return {
+        "procedure_name": name,
+        "decision": decision,
+        "confidence": _mock_confidence(prompt, name),
+        "reasoning": f"Mock reasoning for {name}",
+        "urgency": _mock_pick(prompt, ("ROUTINE", "URGENT", "EMERGENT"), name + "urgency"),
+        "estimated_cost": _mock_pick(prompt, ("LOW", "MODERATE", "HIGH", "VERY_HIGH"), name + "cost"),
+        "missing_info": ["Mock missing information"] if decision == "PENDING_ADDITIONAL_INFO" else [],
+    }
+
+
+def _mock_differential(prompt):
+    return [
+        {"diagnosis": "Mock condition A", "icd10": "R69", "confidence": _mock_confidence(prompt, "dx-a")},
+        {"diagnosis": "Mock condition B", "icd10": "R68.89", "confidence": _mock_confidence(prompt, "dx-b")},
+    ]
+
+
+def create_backend(name, model_name, generation_config, api_key=None):
+    """Build the backend named in config.MODEL_BACKEND"""
+    if name == "mock":
+        return MockBackend(
+            latency_median=MOCK_LATENCY_SECONDS,
+            latency_sigma=MOCK_LATENCY_SIGMA,
+            error_rate=MOCK_ERROR_RATE,
+            rate_limit_rate=MOCK_RATE_LIMIT_RATE,
+            seed=MOCK_SEED,
+        )
+    if name == "gemini":
+        if not api_key:
+            raise ValueError("GEMINI_API_KEY not found in environment or secrets")
+        return GeminiBackend(api_key, model_name, generation_config)
+    raise ValueError(f"Unknown model backend: {name}")
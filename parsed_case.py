@@ -0,0 +1,129 @@
+# parsed_case.py - Parse a case once and share the result
+# Validation, feedback, prompt building and exports all read the same ParsedCase
+
+import hashlib
+import re
+from functools import lru_cache
+
+import text_normalizer
+from procedure_matcher import default_matcher
+from config import CASE_SECTION_LABELS, PARSED_CASE_CACHE_SIZE
+
+# Every section label in one alternation, longest first so "Family History:" beats "History:"
+_SECTION_NAMES = {
+    label.lower(): name for name, labels in CASE_SECTION_LABELS.items() for label in labels
+}
+_LABEL_RE = re.compile(
+    r"(?<!\w)(" + "|".join(re.escape(label) for label in sorted(_SECTION_NAMES, key=len, reverse=True)) + r")\s*:",
+    re.IGNORECASE
+)
+_NUMBERING_RE = re.compile(r'^\d+\.?\s*')
+_LIST_ITEM_RE = re.compile(r'(?:^|\s)\d+[.)]\s+')
+
+# Text before the first label (free-text cases) lands here
+UNLABELLED_SECTION = "Notes"
+
+
+class ParsedCase:
+    """
+    Structured view of one case text - age, labelled sections and procedures
+    Instances are shared through the parse cache, so treat them as read only
+    """
+
+    __slots__ = ("text", "case_hash", "age", "sections", "procedures", "explicit_procedures",
+                 "requested_procedures")
+
+    def __init__(self, text, case_hash, age, sections, procedures, explicit_procedures, requested_procedures):
+        self.text = text
+        self.case_hash = case_hash
+        self.age = age
+        self.sections = sections                        # canonical name -> text
+        self.procedures = procedures                    # tuple, empty when none found
+        self.explicit_procedures = explicit_procedures  # True when taken from a "Procedures Requested:" list
+        self.requested_procedures = requested_procedures  # Itemized request list (also survives sanitizing)
+
+    def section(self, name, default=""):
+        """Text of one section by canonical name (see CASE_SECTION_LABELS)"""
+        return self.sections.get(name, default)
+
+    def to_dict(self):
+        """Plain dict for exports"""
+        return {
+            "case_hash": self.case_hash,
+            "age": self.age,
+            "sections": dict(self.sections),
+            "procedures": list(self.procedures),
+            "explicit_procedures": self.explicit_procedures,
+            "requested_procedures": list(self.requested_procedures),
+        }
+
+
+def parse_case(text):
+    """Parse case text, reusing the earlier result when the same text comes back"""
+    return _parse_cached(text or "")
+
+
+@lru_cache(maxsize=PARSED_CASE_CACHE_SIZE)
+def _parse_cached(text):
+    sections, listed = _lex(text)
+    procedures = tuple(listed) or tuple(default_matcher.find_mentions(text))
+    return ParsedCase(
+        text=text,
+        case_hash=hashlib.sha256(text.encode("utf-8")).hexdigest(),
+        age=text_normalizer.extract_age(text),
+        sections=sections,
+        procedures=procedures,
+        explicit_procedures=bool(listed),
+        requested_procedures=tuple(listed) or _list_items(sections.get("Procedures", "")),
+    )
+
+
+def _lex(text):
+    """
+    One pass over the lines collecting labelled sections and any explicit procedure list
+    Works on multi-line input and on sanitized text where everything sits on one line
+    """
+    parts = {}
+    current = UNLABELLED_SECTION
+
+    text_lower = text.lower()
+    has_procedure_list = "procedures requested:" in text_lower or "requested procedures:" in text_lower
+    in_procedure_section = False
+    listed = []
+
+    for line in text.split("\n"):
+        # Explicit "Procedures Requested:" list - every non-empty line after the heading
+        if has_procedure_list:
+            line_lower = line.lower()
+            if "procedure" in line_lower and "requested" in line_lower:
+                in_procedure_section = True
+            elif in_procedure_section and line.strip():
+                clean_line = _NUMBERING_RE.sub('', line.strip())
+                if clean_line:
+                    listed.append(clean_line)
+
+        position = 0
+        for match in _LABEL_RE.finditer(line):
+            _add_part(parts, current, line[position:match.start()])
+            current = _SECTION_NAMES[match.group(1).lower()]
+            parts.setdefault(current, [])
+            position = match.end()
+        _add_part(parts, current, line[position:])
+
+    sections = {name: "\n".join(pieces) for name, pieces in parts.items()}
+    return sections, listed
+
+
+def _list_items(section_text):
+    """Split a numbered list ("1. CT scan 2. Colonoscopy") that sanitizing put on one line"""
+    if not _LIST_ITEM_RE.match(section_text):
+        return ()
+    items = [item.strip() for item in _LIST_ITEM_RE.split(section_text)]
+    items = [item for item in items if item]
+    return tuple(items) if len(items) > 1 else ()
+
+
+def _add_part(parts, name, piece):
+    piece = piece.strip()
+    if piece:
+        parts.setdefault(name, []).append(piece)
@@ -0,0 +1,123 @@
+# procedure_matcher.py - Aho-Corasick matcher for procedure synonyms
+# One linear pass over the text finds every synonym, whatever the catalog size
+
+import re
+from collections import deque
+from config import PROCEDURE_SYNONYMS
+
+_WORD_RE = re.compile(r"\w")
+
+
+class ProcedureMatcher:
+    """
+    Multi-pattern automaton built once from a {keyword: [synonyms]} catalog
+    Scanning costs O(len(text) + matches) no matter how many synonyms there are
+    """
+
+    def __init__(self, synonym_groups):
+        self.groups = [(keyword, list(synonyms)) for keyword, synonyms in synonym_groups.items()]
+        self._goto = [{}]      # state -> {char: next_state}
+        self._fail = [0]       # state -> longest proper suffix state
+        self._output = [()]    # state -> synonyms ending here (own + via failure links)
+
+        patterns = {synonym.lower() for _, synonyms in self.groups for synonym in synonyms if synonym}
+        self.pattern_count = len(patterns)
+        for pattern in patterns:
+            self._insert(pattern)
+        self._build_failure_links()
+
+    def _insert(self, pattern):
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+                self._goto[state][char] = next_state
+            state = next_state
+        self._output[state] = (pattern,)
+
+    def _build_failure_links(self):
+        """Breadth-first pass computing failure links and merged outputs"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+
+                inherited = self._output[self._fail[next_state]]
+                if inherited:
+                    self._output[next_state] = self._output[next_state] + inherited
+
+    def first_occurrences(self, text):
+        """Map each synonym found in text to the start of its first occurrence"""
+        goto, fail, output = self._goto, self._fail, self._output
+        root = goto[0]
+        found = {}
+        state = 0
+
+        for index, char in enumerate(text):
+            if not state:
+                # Fast path - most characters never leave the root
+                state = root.get(char, 0)
+                if not state:
+                    continue
+            else:
+                while state and char not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(char, 0)
+
+            if output[state]:
+                for pattern in output[state]:
+                    if pattern not in found:
+                        found[pattern] = index - len(pattern) + 1
+                if len(found) == self.pattern_count:
+                    break  # Everything found - no need to read further
+
+        return found
+
+    def find_mentions(self, text):
+        """
+        Procedure mentions for free-text cases, one per keyword group
+        Each mention is the period-delimited phrase around the group's first
+        matching synonym (synonyms are tried in catalog order)
+        """
+        text_lower = text.lower()
+        occurrences = self.first_occurrences(text_lower)
+        if not occurrences:
+            return []
+
+        mentions = []
+        for _, synonyms in self.groups:
+            for synonym in synonyms:
+                start = occurrences.get(synonym.lower())
+                if start is not None:
+                    mentions.append(_surrounding_phrase(text_lower, start, len(synonym)))
+                    break
+        return mentions
+
+
+def _surrounding_phrase(text, start, length):
+    """The sentence containing text[start:start + length], trimmed to whole words"""
+    phrase_start = text.rfind(".", 0, start) + 1
+    phrase_end = text.find(".", start + length)
+    if phrase_end == -1:
+        phrase_end = len(text)
+
+    first_word = _WORD_RE.search(text, phrase_start, phrase_end).start()
+    last_word = phrase_end - 1
+    while not _WORD_RE.match(text, last_word):
+        last_word -= 1
+
+    return text[first_word:last_word + 1]
+
+
+# Built once at import from the default catalog
+default_matcher = ProcedureMatcher(PROCEDURE_SYNONYMS)
@@ -0,0 +1,75 @@
+# prompt_cache.py - Register the static analysis instructions with Gemini context caching
+# One cached-content entry per model and prompt version, shared by every engine in the process
+
+import datetime
+import threading
+import time
+
+from config import PROMPT_CACHE_TTL_SECONDS
+
+# Re-register this long before the cached content expires
+_REFRESH_MARGIN_SECONDS = 300
+# After a transient registration failure (network, 5xx, 429) wait before retrying
+_RETRY_AFTER_SECONDS = 3600
+# Failures retrying can't fix: no caching in the SDK, a model without caching, or
+# instructions under the minimum cached size (400) - recorded until reset_prompt_cache()
+_PERMANENT_ERROR_CODES = ("400", "404")
+
+_entries = {}  # (model_name, version) -> (cached_content or None, valid_until)
+_lock = threading.Lock()
+
+
+def get_cached_instructions(model_name, instructions, version):
+    """
+    Cached-content handle holding the instructions, or None when the backend can't provide one
+    Callers fall back to sending the instructions as a system instruction
+    """
+    key = (model_name, version)
+    now = time.time()
+
+    entry = _entries.get(key)
+    if entry is not None and now < entry[1]:
+        return entry[0]
+
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None and now < entry[1]:
+            return entry[0]
+
+        try:
+            cached = _register(model_name, instructions, version)
+            valid_until = now + PROMPT_CACHE_TTL_SECONDS - _REFRESH_MARGIN_SECONDS
+        except Exception as e:
+            cached = None
+            valid_until = float("inf") if _is_permanent(e) else now + _RETRY_AFTER_SECONDS
+
+        _entries[key] = (cached, valid_until)
+        return cached
+
+
+def _register(model_name, instructions, version):
+    """Create the cached content (raises when caching is unavailable)"""
+    import google.generativeai as genai
+
+    caching = genai.caching  # AttributeError on SDKs without context caching
+    model = model_name if model_name.startswith("models/") else f"models/{model_name}"
+    return caching.CachedContent.create(
+        model=model,
+        display_name=f"msa-analysis-instructions-v{version}",
+        system_instruction=instructions,
+        ttl=datetime.timedelta(seconds=PROMPT_CACHE_TTL_SECONDS),
+    )
+
+
+def _is_permanent(error):
+    """True when registering again can't succeed"""
+    if isinstance(error, AttributeError):
+        return True
+    message = str(error)
+    return any(code in message for code in _PERMANENT_ERROR_CODES)
+
+
+def reset_prompt_cache():
+    """Forget registered entries (tests, key rotation)"""
+    with _lock:
+        _entries.clear()
@@ -0,0 +1,183 @@
+# rate_limiter.py - Proactive requests/tokens per minute limiter for Gemini calls
+
+import asyncio
+import sqlite3
+import threading
+import time
+
+from config import GEMINI_RPM_LIMIT, GEMINI_TPM_LIMIT, RATE_LIMIT_DB
+
+
+def estimate_tokens(text):
+    """Rough token estimate (~4 characters per token) used before the call is made"""
+    return max(1, len(text or "") // 4)
+
+
+class MemoryBucketStore:
+    """Bucket levels shared by every engine in this process"""
+
+    def __init__(self):
+        self._buckets = {}  # name -> (level, updated_at)
+        self._lock = threading.Lock()
+
+    def reserve(self, costs):
+        """
+        Debit each bucket and return how long the caller must wait
+        costs maps bucket name -> (cost, capacity per minute)
+        """
+        now = time.time()
+        with self._lock:
+            wait = 0.0
+            for name, (cost, capacity) in costs.items():
+                level, updated_at = self._buckets.get(name, (capacity, now))
+                level, bucket_wait = _debit(level, updated_at, now, cost, capacity)
+                self._buckets[name] = (level, now)
+                wait = max(wait, bucket_wait)
+            return wait
+
+
+class SQLiteBucketStore:
+    """Bucket levels kept in a SQLite file so several processes on one host share one budget"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_buckets ("
+            "name TEXT PRIMARY KEY, level REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+
+    def _connect(self):
+        """One connection per thread - sqlite3 connections are not thread safe"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def reserve(self, costs):
+        """Same contract as MemoryBucketStore.reserve, atomic across processes"""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            wait = 0.0
+            for name, (cost, capacity) in costs.items():
+                row = conn.execute(
+                    "SELECT level, updated_at FROM rate_buckets WHERE name = ?", (name,)
+                ).fetchone()
+                level, updated_at = row if row else (capacity, now)
+                level, bucket_wait = _debit(level, updated_at, now, cost, capacity)
+                conn.execute(
+                    "INSERT OR REPLACE INTO rate_buckets (name, level, updated_at) VALUES (?, ?, ?)",
+                    (name, level, now)
+                )
+                wait = max(wait, bucket_wait)
+            conn.execute("COMMIT")
+            return wait
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+
+def _debit(level, updated_at, now, cost, capacity):
+    """Refill a bucket for the elapsed time, take the cost and work out the wait"""
+    rate = capacity / 60.0
+    level = min(capacity, level + (now - updated_at) * rate)
+    # Never ask for more than a full bucket or an oversized prompt would wait forever
+    level -= min(cost, capacity)
+    wait = -level / rate if level < 0 else 0.0
+    return level, wait
+
+
+class RateLimiter:
+    """
+    Token-bucket limiter for requests per minute and tokens per minute
+    Callers reserve budget up front and wait their turn instead of hitting 429s
+    """
+
+    def __init__(self, rpm=GEMINI_RPM_LIMIT, tpm=GEMINI_TPM_LIMIT, store=None):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.store = store or MemoryBucketStore()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "acquired": 0,
+            "throttled": 0,
+            "total_wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+            "last_wait_seconds": 0.0,
+        }
+
+    def reserve(self, tokens=0):
+        """Reserve one request plus tokens and return the required wait in seconds"""
+        costs = {}
+        if self.rpm:
+            costs["requests"] = (1, self.rpm)
+        if self.tpm and tokens:
+            costs["tokens"] = (tokens, self.tpm)
+        if not costs:
+            return 0.0
+
+        wait = self.store.reserve(costs)
+        self._record_wait(wait)
+        return wait
+
+    def acquire(self, tokens=0):
+        """Block the calling thread until the request fits the budget"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens=0):
+        """Wait for budget without blocking the event loop"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def record_usage(self, estimated_tokens, actual_tokens):
+        """Debit the difference once the real token count is known"""
+        extra = (actual_tokens or 0) - (estimated_tokens or 0)
+        if self.tpm and extra > 0:
+            self.store.reserve({"tokens": (extra, self.tpm)})
+
+    def stats(self):
+        """Queue wait metrics"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        acquired = stats["acquired"]
+        stats["avg_wait_seconds"] = round(stats["total_wait_seconds"] / acquired, 3) if acquired else 0.0
+        stats["total_wait_seconds"] = round(stats["total_wait_seconds"], 3)
+        stats["max_wait_seconds"] = round(stats["max_wait_seconds"], 3)
+        stats["rpm_limit"] = self.rpm
+        stats["tpm_limit"] = self.tpm
+        stats["backend"] = "sqlite" if isinstance(self.store, SQLiteBucketStore) else "memory"
+        return stats
+
+    def _record_wait(self, wait):
+        with self._stats_lock:
+            self._stats["acquired"] += 1
+            self._stats["last_wait_seconds"] = round(wait, 3)
+            if wait > 0:
+                self._stats["throttled"] += 1
+                self._stats["total_wait_seconds"] += wait
+                self._stats["max_wait_seconds"] = max(self._stats["max_wait_seconds"], wait)
+
+
+_shared_limiter = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_rate_limiter():
+    """Process-wide limiter used by every MedicalAuthorizationAI instance"""
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            store = SQLiteBucketStore(RATE_LIMIT_DB) if RATE_LIMIT_DB else MemoryBucketStore()
+            _shared_limiter = RateLimiter(store=store)
+        return _shared_limiter
@@ -0,0 +1,180 @@
+# result_model.py - Typed view of an authorization result
+# parse_result validates and normalizes a model response in one pass; AuthorizationResult carries
+# the per-decision counts and indexes so rendering and exports never re-scan the procedure list
+
+import json_codec
+
+APPROVED = "APPROVED"
+DENIED = "DENIED"
+PENDING = "PENDING_ADDITIONAL_INFO"
+DECISIONS = (APPROVED, DENIED, PENDING)
+
+# Spellings the model sometimes uses instead of the schema values
+_DECISION_ALIASES = {"PENDING": PENDING, "PENDING_INFO": PENDING, "APPROVE": APPROVED, "DENY": DENIED}
+_LIST_FIELDS = ("missing_info", "alternatives", "guidelines_referenced", "risk_factors")
+
+# Filled in for exports when the model left a field out
+EXPORT_DEFAULTS = {
+    "reasoning": "No AI reasoning provided",
+    "clinical_indication": "Not specified by AI",
+    "urgency": "Not assessed by AI",
+    "estimated_cost": "Not estimated by AI",
+    "missing_info": (),
+    "alternatives": (),
+    "guidelines_referenced": (),
+}
+
+
+class InvalidResponseError(ValueError):
+    """Model returned JSON that doesn't match the expected schema"""
+
+
+class ProcedureDecision:
+    """One procedure's decision; data is the underlying dict (shared, so edits show up in the result)"""
+
+    __slots__ = ("data", "position", "name", "decision", "confidence", "reasoning")
+
+    def __init__(self, data, position):
+        self.data = data
+        self.position = position
+        self.name = data.get('procedure_name') or data.get('procedure_type') or 'Unknown Procedure'
+        self.decision = data.get('decision', 'UNKNOWN')
+        self.confidence = data.get('confidence', 0)
+        self.reasoning = data.get('reasoning', 'No reasoning provided')
+
+
+class AuthorizationResult:
+    """
+    Indexed view over a result dict - single or multiple procedures look the same from here
+    Build it with parse_result for untrusted model output; results that were already validated
+    (cache, case store) can be wrapped directly
+    """
+
+    __slots__ = ("data", "multiple", "procedures", "counts", "by_decision", "by_name")
+
+    def __init__(self, data):
+        self.data = data
+        self.multiple = bool(data.get('multiple_procedures'))
+        items = (data.get('procedures') or []) if self.multiple else [data]
+        self.procedures = tuple(ProcedureDecision(item, position) for position, item in enumerate(items))
+
+        by_decision = {decision: [] for decision in DECISIONS}
+        self.by_name = {}
+        for procedure in self.procedures:
+            # Anything outside the schema counts as pending, like the UI always showed it
+            by_decision.get(procedure.decision, by_decision[PENDING]).append(procedure)
+            self.by_name.setdefault(procedure.name, procedure)
+        self.by_decision = {decision: tuple(items) for decision, items in by_decision.items()}
+        self.counts = {decision: len(items) for decision, items in self.by_decision.items()}
+
+    @property
+    def total(self):
+        return len(self.procedures)
+
+    @property
+    def error(self):
+        return bool(self.data.get('error'))
+
+    def with_decision(self, decision):
+        """Procedures with this decision, in result order"""
+        return self.by_decision.get(decision, ())
+
+    def export_dict(self):
+        """Copy of the result with display defaults for missing fields"""
+        export = dict(self.data)
+        if self.multiple:
+            export['procedures'] = [_with_defaults(procedure.data) for procedure in self.procedures]
+        return export
+
+
+def _with_defaults(procedure):
+    exported = dict(procedure)
+    for field, default in EXPORT_DEFAULTS.items():
+        exported.setdefault(field, default)
+    return exported
+
+
+def parse_result(raw):
+    """
+    Decode (str, bytes or an already-decoded dict) and validate a model response in one pass
+    Normalizes as it goes - decision aliases, confidence clamped to 0-100, null or bare-string list fields
+    Raises InvalidResponseError (or JSONDecodeError for malformed JSON)
+    """
+    data = json_codec.loads(raw) if isinstance(raw, (str, bytes, bytearray, memoryview)) else raw
+    if not isinstance(data, dict):
+        raise InvalidResponseError("Response is not a JSON object")
+
+    if data.get('multiple_procedures'):
+        procedures = data.get('procedures')
+        if not isinstance(procedures, list) or not procedures:
+            raise InvalidResponseError("procedures must be a non-empty list")
+        for position, procedure in enumerate(procedures):
+            _validate_procedure(procedure, f"procedures[{position}]")
+    else:
+        _validate_procedure(data, "result")
+
+    diagnoses = data.get('differential_diagnosis')
+    if diagnoses is not None:
+        if not isinstance(diagnoses, list):
+            raise InvalidResponseError("differential_diagnosis must be a list")
+        for position, diagnosis in enumerate(diagnoses):
+            if not isinstance(diagnosis, dict):
+                raise InvalidResponseError(f"differential_diagnosis[{position}] must be an object")
+            if 'confidence' in diagnosis:
+                diagnosis['confidence'] = _confidence(diagnosis['confidence'], f"differential_diagnosis[{position}]")
+
+    return AuthorizationResult(data)
+
+
+def parse_procedure(procedure, where="procedure"):
+    """
+    Validate and normalize one procedure decision in place (streamed cards)
+    Same rules parse_result applies to every procedure; raises InvalidResponseError
+    """
+    _validate_procedure(procedure, where)
+    return procedure
+
+
+def _validate_procedure(procedure, where):
+    if not isinstance(procedure, dict):
+        raise InvalidResponseError(f"{where} must be an object")
+
+    decision = procedure.get('decision')
+    if not isinstance(decision, str):
+        raise InvalidResponseError(f"{where}.decision is missing")
+    decision = decision.strip().upper()
+    decision = _DECISION_ALIASES.get(decision, decision)
+    if decision not in DECISIONS:
+        raise InvalidResponseError(f"{where}.decision {procedure['decision']!r} is not one of {', '.join(DECISIONS)}")
+    procedure['decision'] = decision
+
+    if 'confidence' not in procedure:
+        raise InvalidResponseError(f"{where}.confidence is missing")
+    procedure['confidence'] = _confidence(procedure['confidence'], where)
+
+    if not isinstance(procedure.get('reasoning'), str):
+        raise InvalidResponseError(f"{where}.reasoning is missing")
+
+    for field in _LIST_FIELDS:
+        if field not in procedure:
+            continue
+        value = procedure[field]
+        if value is None:
+            procedure[field] = []
+        elif isinstance(value, str):
+            procedure[field] = [value] if value.strip() else []
+        elif not isinstance(value, list):
+            raise InvalidResponseError(f"{where}.{field} must be a list")
+
+
+def _confidence(value, where):
+    """Confidence as an int clamped to 0-100 (accepts "85" and "85%")"""
+    if isinstance(value, str):
+        value = value.strip().rstrip('%')
+        try:
+            value = float(value)
+        except ValueError:
+            raise InvalidResponseError(f"{where}.confidence is not a number") from None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise InvalidResponseError(f"{where}.confidence is not a number")
+    return max(0, min(100, int(round(value))))
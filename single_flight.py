@@ -0,0 +1,91 @@
+# single_flight.py - Coalesce identical in-flight requests onto one upstream call
+# Threads and asyncio callers share the same registry, so a duplicate burst costs one call
+
+import asyncio
+import copy
+import threading
+from concurrent.futures import Future
+
+
+class LeaderAbandoned(Exception):
+    """The call the followers were waiting on ended without a result (e.g. an abandoned stream)"""
+
+
+class SingleFlight:
+    """
+    One in-flight call per key; later callers with the same key wait for it
+    Followers receive a deep copy of the leader's result so nobody shares a mutable dict
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> concurrent.futures.Future
+
+    def join(self, key):
+        """(future, is_leader) - a leader must call finish() or abandon() for the key"""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future, False
+            future = self._calls[key] = Future()
+            return future, True
+
+    def finish(self, key, result):
+        """Hand a snapshot of the leader's result to every follower - the leader's caller may mutate the original"""
+        try:
+            snapshot = copy.deepcopy(result)
+        except Exception as e:
+            self.abandon(key, e)  # Followers must never wait on a key nobody will finish
+            raise
+        with self._lock:
+            future = self._calls.pop(key)
+        future.set_result(snapshot)
+
+    def abandon(self, key, error=None):
+        """Leader failed or gave up - followers see the error (LeaderAbandoned by default)"""
+        with self._lock:
+            future = self._calls.pop(key, None)
+        if future is not None:  # Already abandoned by a failed finish()
+            future.set_exception(error or LeaderAbandoned(key))
+
+    def run(self, key, func):
+        """Return func(), or the result of an identical call already in flight; second value is True when shared"""
+        while True:
+            future, leader = self.join(key)
+            if leader:
+                return self._lead(key, func), False
+            try:
+                return copy.deepcopy(future.result()), True
+            except LeaderAbandoned:
+                continue  # Take over as the next leader
+
+    async def run_async(self, key, coro_func):
+        """Async run - waiting for another caller's call never blocks the event loop"""
+        while True:
+            future, leader = self.join(key)
+            if leader:
+                try:
+                    result = await coro_func()
+                except BaseException as e:
+                    self.abandon(key, e if isinstance(e, Exception) else None)
+                    raise
+                self.finish(key, result)
+                return result, False
+            try:
+                # shield: a cancelled follower must not cancel the shared future
+                return copy.deepcopy(await asyncio.shield(asyncio.wrap_future(future))), True
+            except LeaderAbandoned:
+                continue
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+    def _lead(self, key, func):
+        try:
+            result = func()
+        except BaseException as e:
+            self.abandon(key, e if isinstance(e, Exception) else None)
+            raise
+        self.finish(key, result)
+        return result
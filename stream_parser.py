@@ -0,0 +1,78 @@
+# stream_parser.py - Incremental JSON scanner for streamed model responses
+# Pulls each finished procedure out of {"procedures": [...]} while the rest is still arriving
+
+import json_codec
+
+
+class ProcedureStreamParser:
+    """
+    Feed response chunks in order; feed() returns the procedure objects completed so far
+    Each character is scanned once, so the whole stream costs O(response length)
+    """
+
+    def __init__(self, array_key="procedures"):
+        self.array_key = array_key
+        self.text = ""               # Everything received so far
+        self._position = 0           # Next character to scan
+        self._stack = []             # Open containers: "{" or "["
+        self._in_string = False
+        self._escaped = False
+        self._string_start = None
+        self._last_key = None        # Last string closed directly inside the top-level object
+        self._array_depth = None     # Stack depth inside the procedures array
+        self._object_start = None    # Start of the procedure object being read
+        self.completed = 0
+
+    def feed(self, chunk):
+        """Add a chunk and return the procedures that closed inside it"""
+        if not chunk:
+            return []
+        self.text += chunk
+        text = self.text
+
+        found = []
+        stack = self._stack
+        for index in range(self._position, len(text)):
+            char = text[index]
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if len(stack) == 1:
+                        self._last_key = text[self._string_start + 1:index]
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = index
+            elif char == "{" or char == "[":
+                if char == "{" and self._array_depth is not None and len(stack) == self._array_depth:
+                    self._object_start = index
+                stack.append(char)
+                if char == "[" and len(stack) == 2 and self._last_key == self.array_key:
+                    self._array_depth = len(stack)
+            elif char == "}" or char == "]":
+                if stack:
+                    stack.pop()
+                if self._array_depth is not None:
+                    if char == "}" and self._object_start is not None and len(stack) == self._array_depth:
+                        found.append(self._decode(text[self._object_start:index + 1]))
+                        self._object_start = None
+                    elif len(stack) < self._array_depth:
+                        self._array_depth = None  # Array closed
+
+        self._position = len(text)
+        found = [procedure for procedure in found if procedure is not None]
+        self.completed += len(found)
+        return found
+
+    def _decode(self, fragment):
+        try:
+            procedure = json_codec.loads(fragment)
+        except ValueError:
+            return None
+        return procedure if isinstance(procedure, dict) else None
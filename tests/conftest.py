@@ -0,0 +1,7 @@
+# conftest.py - Tests import the flat modules from the repository root, like the benchmarks do
+# Run: python -m pytest tests
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
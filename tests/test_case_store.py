@@ -0,0 +1,92 @@
+# test_case_store.py - Queued writes, flush failures and requeue ordering in the SQLite case store
+
+import sqlite3
+
+import pytest
+
+from case_store import CaseStore
+
+RESULT = {"decision": "APPROVED", "confidence": 90, "procedure_type": "MRI lumbar spine"}
+
+
+@pytest.fixture
+def store(tmp_path):
+    # The background writer stays idle so each test decides when a flush happens
+    store = CaseStore(path=str(tmp_path / "cases.db"), batch_size=10 ** 6, flush_seconds=3600)
+    store._connect().execute("PRAGMA busy_timeout=0")  # Fail fast on a locked database instead of waiting 30s
+    return store
+
+
+@pytest.fixture
+def lock_db(store):
+    """Hold an exclusive lock on the store's database until released"""
+    holder = sqlite3.connect(store.path, isolation_level=None)
+    holder.execute("BEGIN EXCLUSIVE")
+    yield holder.rollback
+    holder.close()
+
+
+def test_reads_see_queued_writes(store):
+    case_id = store.record_case("case text", RESULT, session_id="s1", model="mock")
+    assert store.health()["pending_writes"] == 2
+
+    case = store.get_case(case_id)
+    assert case["case_text"] == "case text"
+    assert case["result"] == RESULT
+    assert store.health()["pending_writes"] == 0
+
+
+def test_unrelated_read_does_not_flush(store):
+    store.record_case("case text", RESULT, session_id="s1")
+    assert store.get_case("missing") is None
+    assert store.list_cases(session_id="s2") == ([], None)
+    assert store.health()["pending_writes"] == 2
+
+
+def test_locked_flush_requeues_in_order(store, lock_db):
+    case_id = store.record_case("case text", RESULT, session_id="s1")
+    with pytest.raises(sqlite3.OperationalError):
+        store.flush()
+    assert store.health()["pending_writes"] == 2
+    assert "locked" in store.health()["write_error"]
+
+    # Queued after the failed batch; it references the case, so it only succeeds if the case goes in first
+    store.record_justification(case_id, "MRI lumbar spine", "Six weeks of therapy", "DENIED", "APPROVED",
+                               "Sufficient", True)
+    lock_db()
+
+    assert store.flush() == 3
+    assert store.count_justifications(case_id) == 1
+    assert store.health() == {"pending_writes": 0, "write_error": None, "dropped_writes": 0, "last_dropped": None}
+
+
+def test_requeued_writes_stay_visible_to_reads(store, lock_db):
+    case_id = store.record_case("case text", RESULT, session_id="s1")
+    with pytest.raises(sqlite3.OperationalError):
+        store.flush()
+    lock_db()
+
+    assert store.get_case(case_id) is not None  # The requeued case is still marked dirty
+    cases, _ = store.list_cases(session_id="s1")
+    assert [case["id"] for case in cases] == [case_id]
+
+
+def test_bad_row_is_dropped_without_sinking_the_batch(store):
+    store.record_justification("no-such-case", "MRI", "text", "DENIED", "APPROVED", "ok", True)
+    case_id = store.record_case("case text", RESULT)
+
+    assert store.flush() == 3
+    assert store.get_case(case_id) is not None
+    health = store.health()
+    assert health["dropped_writes"] == 1
+    assert "FOREIGN KEY" in health["last_dropped"]
+    assert health["write_error"] is None
+
+
+def test_delete_scoped_to_session(store):
+    case_id = store.record_case("case text", RESULT, session_id="s1")
+    store.delete_case(case_id, session_id="s2")
+    assert store.get_case(case_id) is not None
+
+    store.delete_case(case_id, session_id="s1")
+    assert store.get_case(case_id) is None
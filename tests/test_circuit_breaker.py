@@ -0,0 +1,134 @@
+# test_circuit_breaker.py - State transitions and generation handling of the circuit breaker
+
+import pytest
+
+import circuit_breaker
+from circuit_breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+
+
+class Clock:
+    """Stand-in for time.monotonic that only moves when told to"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", clock)
+    return clock
+
+
+def make_breaker(**overrides):
+    settings = dict(error_rate=0.5, window=10, min_calls=4, open_seconds=30, half_open_probes=2)
+    settings.update(overrides)
+    return CircuitBreaker(**settings)
+
+
+def trip(breaker):
+    """Fail calls until the breaker opens"""
+    while breaker.state == CLOSED:
+        breaker.record_failure(breaker.allow())
+
+
+def test_opens_at_error_rate_after_min_calls(clock):
+    breaker = make_breaker()
+    for _ in range(3):
+        breaker.record_failure(breaker.allow())
+    assert breaker.state == CLOSED  # Below min_calls
+
+    breaker.record_failure(breaker.allow())
+    assert breaker.state == OPEN
+    assert breaker.allow() is None
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_successes_keep_it_closed(clock):
+    breaker = make_breaker()
+    for _ in range(6):
+        breaker.record_success(breaker.allow())
+    for _ in range(4):
+        breaker.record_failure(breaker.allow())
+    assert breaker.state == CLOSED  # 4 of 10 calls failed, under the 0.5 error rate
+    assert breaker.stats()["window_calls"] == 10
+
+    breaker.record_failure(breaker.allow())
+    assert breaker.state == OPEN  # The oldest success left the window - 5 of 10 now
+
+
+def test_half_open_probes_close_it(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    clock.now += 30
+    assert breaker.state == HALF_OPEN
+
+    probes = [breaker.allow(), breaker.allow()]
+    assert all(probes)
+    assert breaker.allow() is None  # Only half_open_probes calls at a time
+
+    for probe in probes:
+        breaker.record_success(probe)
+    assert breaker.state == CLOSED
+    assert breaker.stats()["window_calls"] == 0
+
+
+def test_failed_probe_reopens(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    clock.now += 30
+    breaker.record_failure(breaker.allow())
+    assert breaker.state == OPEN
+    assert breaker.stats()["times_opened"] == 2
+
+
+def test_stale_failure_ignored_after_opening(clock):
+    breaker = make_breaker()
+    slow_call = breaker.allow()
+    trip(breaker)
+    clock.now += 30
+    probe = breaker.allow()
+
+    breaker.record_failure(slow_call)  # Admitted while closed - must not sink the probe
+    assert breaker.state == HALF_OPEN
+    breaker.record_success(probe)
+    breaker.record_success(breaker.allow())
+    assert breaker.state == CLOSED
+
+
+def test_stale_success_does_not_count_as_probe(clock):
+    breaker = make_breaker(half_open_probes=1)
+    slow_call = breaker.allow()
+    trip(breaker)
+    clock.now += 30
+    assert breaker.state == HALF_OPEN
+
+    breaker.record_success(slow_call)
+    assert breaker.state == HALF_OPEN
+
+
+def test_stale_outcomes_ignored_after_closing(clock):
+    breaker = make_breaker(half_open_probes=1)
+    trip(breaker)
+    clock.now += 30
+    probe = breaker.allow()
+    breaker.record_success(probe)
+    assert breaker.state == CLOSED
+
+    breaker.record_success(probe)  # Reported twice
+    breaker.record_failure(probe)
+    assert breaker.stats()["window_calls"] == 0
+
+
+def test_release_frees_probe_slot(clock):
+    breaker = make_breaker(half_open_probes=1)
+    trip(breaker)
+    clock.now += 30
+    probe = breaker.allow()
+    assert breaker.allow() is None
+
+    breaker.release(probe)
+    assert breaker.allow() is not None
@@ -0,0 +1,50 @@
+# test_export_cache.py - Build-once behaviour of the export artifact cache
+
+import threading
+
+import pytest
+
+from export_cache import ExportCache
+
+
+def test_builds_once_and_evicts_oldest():
+    cache = ExportCache(max_entries=2)
+    builds = []
+    for key in ("a", "b", "a", "c"):
+        cache.get_or_build(key, lambda key=key: builds.append(key) or key.encode())
+
+    assert builds == ["a", "b", "c"]
+    assert cache.stats() == {"hits": 1, "builds": 3, "evictions": 1, "size": 2}
+
+
+def test_failed_build_is_forgotten():
+    cache = ExportCache(max_entries=2)
+
+    def fail():
+        raise RuntimeError("render failed")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_build("a", fail)
+    assert cache._building == {}
+    assert cache.get_or_build("a", lambda: b"ok") == b"ok"
+
+
+def test_concurrent_callers_share_one_build():
+    cache = ExportCache(max_entries=2)
+    release, builds = threading.Event(), []
+
+    def build():
+        builds.append(1)
+        release.wait(5)
+        return b"artifact"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_build("a", build))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == [b"artifact"] * 8
+    assert len(builds) == 1
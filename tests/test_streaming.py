@@ -0,0 +1,87 @@
+# test_streaming.py - Streamed procedure cards go through the same validation as parse_result
+
+import json
+
+import pytest
+
+import ai_engine
+from ai_engine import MedicalAuthorizationAI
+from model_backends import ModelBackend, BackendResponse, BackendStream
+from rate_limiter import RateLimiter
+from result_model import parse_result
+
+CASE = "58 year old with chest pain. Procedures requested: CT chest; MRI brain"
+PROCEDURES = [
+    {"procedure_name": "CT chest", "decision": "Approved", "confidence": "85%", "reasoning": "Indicated",
+     "missing_info": None},
+    {"procedure_name": "MRI brain", "decision": "deny", "confidence": 140, "reasoning": "Not indicated"},
+]
+
+
+class FixedBackend(ModelBackend):
+    """Returns the same body for every call, streamed in small chunks"""
+
+    name = "fixed"
+
+    def __init__(self, body):
+        self.body = body
+        self.calls = 0
+
+    def generate(self, prompt, instructions=None):
+        self.calls += 1
+        return BackendResponse(self.body)
+
+    def generate_stream(self, prompt, instructions=None):
+        self.calls += 1
+
+        def chunks(stream):
+            for start in range(0, len(self.body), 17):
+                yield self.body[start:start + 17]
+
+        return BackendStream(chunks)
+
+
+def make_engine(procedures):
+    backend = FixedBackend(json.dumps({"multiple_procedures": True, "procedures": procedures}))
+    engine = MedicalAuthorizationAI(backend=backend, rate_limiter=RateLimiter(rpm=0, tpm=0),
+                                    fallback_model=None, cache=False, fanout=False)
+    return engine, backend
+
+
+def test_streamed_cards_match_parse_result():
+    engine, backend = make_engine(PROCEDURES)
+    events = list(engine.analyze_case_stream(CASE))
+
+    cards = [payload for kind, payload in events if kind == "procedure"]
+    expected = parse_result(backend.body).data["procedures"]
+    fields = ("procedure_name", "decision", "confidence", "missing_info")
+    assert [{name: card.get(name) for name in fields} for card in cards] == \
+        [{name: procedure.get(name) for name in fields} for procedure in expected]
+    assert [(card["decision"], card["confidence"]) for card in cards] == [("APPROVED", 85), ("DENIED", 100)]
+
+    final = events[-1][1]
+    assert not final.get("error")
+    assert [(p["decision"], p["confidence"]) for p in final["procedures"]] == [("APPROVED", 85), ("DENIED", 100)]
+    assert backend.calls == 1
+    assert engine.breaker.stats()["window_calls"] == 1
+    assert engine.breaker.stats()["error_rate"] == 0.0
+
+
+def test_sync_and_stream_agree():
+    engine, _ = make_engine(PROCEDURES)
+    streamed = list(engine.analyze_case_stream(CASE))[-1][1]
+    analyzed = engine.analyze_case(CASE)
+    assert [(p["decision"], p["confidence"]) for p in streamed["procedures"]] == \
+        [(p["decision"], p["confidence"]) for p in analyzed["procedures"]]
+
+
+@pytest.mark.parametrize("field, value", [("decision", "maybe"), ("confidence", "high")])
+def test_invalid_streamed_card_is_not_a_backend_failure(monkeypatch, field, value):
+    monkeypatch.setattr(ai_engine.time, "sleep", lambda seconds: None)  # Skip the retry backoff
+    procedures = [PROCEDURES[0], dict(PROCEDURES[1], **{field: value})]
+    engine, _ = make_engine(procedures)
+    events = list(engine.analyze_case_stream(CASE))
+
+    assert [kind for kind, _ in events].count("procedure") <= 1  # The valid card is never emitted twice
+    assert events[-1][1].get("error")
+    assert engine.breaker.stats()["error_rate"] == 0.0  # The model answered; the answer was bad
@@ -0,0 +1,125 @@
+# text_normalizer.py - Precompiled text normalization for case input
+# Everything is built once at import; utils.py delegates here
+
+import re
+from config import AGE_PATTERNS, MEDICAL_ABBREVIATIONS
+
+# Characters sanitize_medical_input strips out
+_HARMFUL_TABLE = str.maketrans("", "", "<>{}[]\\")
+
+# Every abbreviation in one case-sensitive alternation, longest first.
+# It runs on lowercased text: a plain literal alternation lets the regex
+# engine skip ahead quickly, while IGNORECASE and leading \b both disable that.
+_ABBREVIATION_LOOKUP = {abbrev.lower(): full for abbrev, full in MEDICAL_ABBREVIATIONS.items()}
+_ABBREVIATIONS = "|".join(
+    re.escape(abbrev) for abbrev in sorted(_ABBREVIATION_LOOKUP, key=len, reverse=True)
+)
+_ABBREVIATION_RE = re.compile(_ABBREVIATIONS)
+_ABBREVIATION_RE_IGNORECASE = re.compile(rf"\b(?:{_ABBREVIATIONS})\b", re.IGNORECASE)
+
+# Numeric age patterns from config in one scan. Each branch is a zero-width
+# lookahead so "age: 58" never hides the "58 years old" that starts inside it.
+_AGE_SCAN_PARTS = [
+    ("decade", AGE_PATTERNS[6]),   # "60s"
+    ("exact0", AGE_PATTERNS[0]),   # "58 years old"
+    ("exact1", AGE_PATTERNS[1]),   # "58, male"
+    ("exact2", AGE_PATTERNS[2]),   # "age: 58"
+]
+_AGE_SCAN_RE = re.compile(
+    r"(?=[\da])(?:" + "|".join(f"(?=(?P<{name}>{pattern}))" for name, pattern in _AGE_SCAN_PARTS) + ")"
+)
+_AGE_VALUE_GROUP = {name: _AGE_SCAN_RE.groupindex[name] + 1 for name, _ in _AGE_SCAN_PARTS}
+
+
+def _is_word_char(char):
+    """Same definition of a word character as the regex \\w / \\b"""
+    return char.isalnum() or char == "_"
+
+
+def _expand_ignorecase(match):
+    """Replacement callback for the Unicode path (e.g. "ſob" matches "sob" under IGNORECASE)"""
+    word = match.group()
+    full = _ABBREVIATION_LOOKUP.get(word.lower())
+    if full is None:
+        full = next(full for abbrev, full in _ABBREVIATION_LOOKUP.items()
+                    if re.fullmatch(re.escape(abbrev), word, re.IGNORECASE))
+    return full
+
+
+def sanitize(text):
+    """Strip harmful characters, collapse whitespace and trim"""
+    if not text:
+        return text
+    return " ".join(text.translate(_HARMFUL_TABLE).split())
+
+
+def expand_abbreviations(text):
+    """Expand every known medical abbreviation (whole words, any case) in one pass"""
+    if not text:
+        return text
+
+    lowered = text.lower()
+    if not text.isascii() or len(lowered) != len(text):
+        # Unicode case mapping can shift offsets - use the slower exact path
+        return _ABBREVIATION_RE_IGNORECASE.sub(_expand_ignorecase, text)
+
+    pieces = []
+    last_end = 0
+    text_length = len(text)
+    for match in _ABBREVIATION_RE.finditer(lowered):
+        start, end = match.span()
+        # Whole words only - the \b checks the pattern leaves out
+        if start > 0 and _is_word_char(text[start - 1]) == _is_word_char(text[start]):
+            continue
+        if end < text_length and _is_word_char(text[end - 1]) == _is_word_char(text[end]):
+            continue
+        if end == text_length and not _is_word_char(text[end - 1]):
+            continue
+        pieces.append(text[last_end:start])
+        pieces.append(_ABBREVIATION_LOOKUP[match.group()])
+        last_end = end
+
+    if not pieces:
+        return text
+    pieces.append(text[last_end:])
+    return "".join(pieces)
+
+
+def extract_age(text):
+    """Find the patient age - keyword checks first, then one scan for numeric ages"""
+    if not text:
+        return None
+
+    text_lower = text.lower()
+
+    # Handle special age descriptions
+    if 'elderly' in text_lower or 'senior' in text_lower:
+        return "65+"
+    if 'middle' in text_lower and 'age' in text_lower:
+        return "45-65"
+    if 'young adult' in text_lower:
+        return "18-35"
+
+    found = {}
+    for match in _AGE_SCAN_RE.finditer(text_lower):
+        kind = match.lastgroup
+        value = match.group(_AGE_VALUE_GROUP[kind])
+        if kind == "decade":
+            return f"{int(value)}0s"  # "60s" outranks every specific age
+        found.setdefault(kind, value)
+
+    for name in ("exact0", "exact1", "exact2"):
+        if name in found:
+            return found[name]
+    return None
+
+
+def normalize_case(text):
+    """
+    Sanitize and expand abbreviations - matches clean_input(sanitize_medical_input(text))
+    The age comes from parse_case on the cleaned text, which validation and the engine share
+    """
+    if not text:
+        return text
+
+    return expand_abbreviations(sanitize(text))